@@ -3,6 +3,9 @@ from tkinter import ttk
 import paho.mqtt.client as mqtt
 import json
 import os
+import tempfile
+import threading
+import time
 import cv2
 import numpy as np
 from PIL import Image, ImageTk
@@ -16,6 +19,8 @@ from client_modules.sensor_panel import SensorPanel
 from client_modules.sensor_tab import SensorTabPanel
 from client_modules.settings_panel import SettingsPanel
 from client_modules.model_info_panel import AprilTagPanel
+from lib import json_codec
+from lib.tk_helpers import configure_cached
 
 class RoverControlApp:
     def __init__(self, root):
@@ -26,17 +31,27 @@ class RoverControlApp:
         # Config file path
         self.config_file = "./client/rover_config.json"
         
+        # Parsed configuration, shared by the panels and written back by persist_config
+        self.config = {}
+        self._config_pending = None
+        self._config_lock = threading.Lock()
+        self._config_write_lock = threading.Lock()
+        
         # Stream variables
         self.stream_active = False
         self.capture = None
         
         # MQTT variables
-        self.mqtt_client = None
         self.mqtt_connected = False
         self.MQTT_PORT = 1883
         self.TOPIC_SEND = "laptop_to_pi"
         self.TOPIC_RECEIVE = "pi_to_laptop"
         
+        # Outbound messages are buffered briefly and published together
+        self.TX_BATCH_INTERVAL = 20  # milliseconds
+        self._tx_buf = []
+        self._tx_scheduled = False
+        
         # Camera variables
         self.CAMERA_PORT = 7123
         self.CAMERA_REFRESH_RATE = 10  # milliseconds
@@ -49,14 +64,53 @@ class RoverControlApp:
         self.humiture_data = {"temperature_c": 0, "humidity": 0}
         self.spectral_data = {"violet": 0, "blue": 0, "green": 0, "yellow": 0, "orange": 0, "red": 0}
         
+        # Set by the MQTT thread when new data arrives; the displays are redrawn
+        # at most once per SENSOR_REFRESH_RATE
+        self._sensor_dirty = False
+        self._humiture_dirty = False
+        self._spectral_dirty = False
+        
         # AprilTag data
         self.detected_tags = []
         self.apriltag_enabled = True
         self.APRILTAG_REFRESH_RATE = 500  # milliseconds
         
+        # Handlers for JSON messages from the Pi, keyed by message type
+        self._msg_handlers = {
+            "sensor_data": self._handle_sensor,
+            "humiture_data": self._handle_humiture,
+            "spectral_data": self._handle_spectral
+        }
+        
+        # Panels are created below; callbacks can fire before all of them exist
+        self.connection_panel = None
+        self.controls_panel = None
+        self.camera_panel = None
+        self.settings_panel = None
+        self.console_panel = None
+        self.sensor_tab_panel = None
+        self.april_tag_panel = None
+        self.sensor_panel = None
+        
         # Load settings if available
         self.load_config()
         
+        # A single MQTT client is created up front and reused across reconnects
+        self.mqtt_client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        self.mqtt_client.on_message = self.on_mqtt_message
+        self.mqtt_client.on_connect = self.on_mqtt_connect
+        self.mqtt_client.on_disconnect = self.on_mqtt_disconnect
+        
+        # Bound Paho's outbound buffering so a congested link drops
+        # telemetry instead of growing memory without limit
+        self.mqtt_client.max_queued_messages_set(256)
+        self.mqtt_client.max_inflight_messages_set(32)
+        
+        # Paho's network loop runs on one thread for the whole app; it serves a
+        # session whenever _mqtt_session is set (see _mqtt_network_loop)
+        self._mqtt_session = threading.Event()
+        self._mqtt_loop_started = False
+        
         # Main horizontal paned window for resizable left and right sections
         main_paned_window = tk.PanedWindow(root, orient=tk.HORIZONTAL, sashrelief=tk.RAISED)
         main_paned_window.pack(fill=tk.BOTH, expand=True)
@@ -116,15 +170,17 @@ class RoverControlApp:
         bottom_paned_window.add(sensor_frame, width=300)
         self.sensor_panel = SensorPanel(sensor_frame, self)
         
-        # Start the april tag update cycle
+        # Start the april tag and sensor display update cycles
         self.update_april_tag_display()
+        self.root.after(self.SENSOR_REFRESH_RATE, self._drain_ui)
         
     def load_config(self):
         """Load configuration from JSON file"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    config = json_codec.loads(f.read())
+                self.config = config
                 
                 # Load ports
                 self.MQTT_PORT = config.get('mqtt_port', 1883)
@@ -155,23 +211,57 @@ class RoverControlApp:
                     }
                 }
                 
-                with open(self.config_file, 'w') as f:
-                    json.dump(default_config, f, indent=4)
+                self.config = default_config
+                self.persist_config()
                 
                 self.log_to_console(f"Created default configuration in {self.config_file}")
         except Exception as e:
             print(f"Error loading configuration: {e}")
             self.log_to_console(f"Error loading configuration: {e}")
     
+    def persist_config(self):
+        """Write the cached configuration to disk on a background thread"""
+        # Serialize here so the writer never sees the dict mid-update
+        data = json_codec.dumps(self.config, indent=True)
+        with self._config_lock:
+            self._config_pending = data
+        threading.Thread(target=self._write_config, daemon=True).start()
+    
+    def _write_config(self):
+        """Atomically replace the config file with the newest pending contents"""
+        with self._config_write_lock:
+            with self._config_lock:
+                data = self._config_pending
+                self._config_pending = None
+            if data is None:
+                return  # A later write already saved these contents
+            
+            config_dir = os.path.dirname(self.config_file) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=config_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.config_file)
+            except Exception as e:
+                print(f"Error saving configuration: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    
     def update_april_tag_display(self):
         """Update the April Tag display with currently detected tags"""
-        if hasattr(self, 'camera_panel'):
-            # Get current tags from camera panel
-            tags = self.camera_panel.current_tags
-            
-            # Update the panel if available
-            if hasattr(self, 'april_tag_panel'):
-                self.april_tag_panel.update_tags_display(tags)
+        if self.camera_panel is not None:
+            # Only redraw when the camera panel has new detection results
+            if self.camera_panel.tags_dirty:
+                self.camera_panel.tags_dirty = False
+                
+                # Get current tags from camera panel
+                tags = self.camera_panel.current_tags
+                
+                # Update the panel if available
+                if self.april_tag_panel is not None:
+                    self.april_tag_panel.update_tags_display(tags)
         
         # Schedule the next update
         self.root.after(self.APRILTAG_REFRESH_RATE, self.update_april_tag_display)
@@ -182,7 +272,7 @@ class RoverControlApp:
             # Start connection
             if self.connect_mqtt():
                 self.stream_active = True
-                self.connection_panel.connect_button.config(text="Disconnect")
+                configure_cached(self.connection_panel.connect_button, text="Disconnect")
                 self.controls_panel.update_control_buttons(True)
             else:
                 # Connection failed
@@ -197,67 +287,79 @@ class RoverControlApp:
                 self.camera_panel.stop_camera()
                 
             self.stream_active = False
-            self.connection_panel.connect_button.config(text="Connect")
+            configure_cached(self.connection_panel.connect_button, text="Connect")
             self.controls_panel.update_control_buttons(False)
         
-        # Update camera buttons based on connection state
+        # Update camera buttons based on connection state (unchanged states are skipped)
         self.update_camera_buttons()
     
     def update_camera_buttons(self):
         """Update camera button states based on connection status"""
         if self.stream_active:
             # Connection active, enable start camera button
-            self.camera_panel.start_camera_btn.config(state=tk.NORMAL)
-            self.camera_panel.stop_camera_btn.config(state=tk.DISABLED)
+            configure_cached(self.camera_panel.start_camera_btn, state=tk.NORMAL)
+            configure_cached(self.camera_panel.stop_camera_btn, state=tk.DISABLED)
         else:
             # Connection inactive, disable both camera buttons
-            self.camera_panel.start_camera_btn.config(state=tk.DISABLED)
-            self.camera_panel.stop_camera_btn.config(state=tk.DISABLED)
+            configure_cached(self.camera_panel.start_camera_btn, state=tk.DISABLED)
+            configure_cached(self.camera_panel.stop_camera_btn, state=tk.DISABLED)
     
     def key_press_handler(self, button_name):
         """Handle keyboard press events by simulating button presses"""
-        if self.mqtt_connected:
-            # Flash the corresponding button to give visual feedback
-            button = self.controls_panel.control_buttons[button_name]
-            original_bg = button.cget("background")
-            button.config(background="yellow")
-            self.root.after(100, lambda: button.config(background=original_bg))
-            
-            # Send the command associated with the key
-            command = self.controls_panel.control_commands[button_name]
-            self.send_command(command)
+        # Flashing the button and sending its command is precomputed per button
+        self.controls_panel.key_handlers[button_name]()
     
     def on_mqtt_message(self, client, userdata, msg):
         """Callback function for received MQTT messages"""
-        message = msg.payload.decode()
-        
         try:
             # Try to parse as JSON (for sensor data)
-            data = json.loads(message)
-            if "type" in data and data["type"] == "sensor_data":
-                # Extract sensor values
-                self.accel_data = data.get("accelerometer", [0, 0, 0])
-                self.gyro_data = data.get("gyroscope", [0, 0, 0])
-                self.temp_data = data.get("temperature", 0)
-                
-                # Update displays in both panels with proper refresh rate
-                self.root.after(0, lambda: self.update_sensor_displays())
-                
+            data = json_codec.loads(msg.payload)
+        except json.JSONDecodeError:
+            data = None
+        
+        if isinstance(data, dict):
+            handler = self._msg_handlers.get(data.get("type"))
+            if handler:
                 # No need to log these high-frequency messages to console
+                handler(data)
                 return
-            elif "type" in data and data["type"] == "humiture_data":
-                self.humiture_data = data.get("data", {"temperature_c": 0, "humidity": 0})
-                self.root.after(0, lambda: self.update_humiture_display())
-                return # Don't log to console
-            elif "type" in data and data["type"] == "spectral_data":
-                self.spectral_data = data.get("data", {})
-                self.root.after(0, lambda: self.update_spectral_display())
-                return # Don't log to console
-        except json.JSONDecodeError:
-            # Regular text message, log to console
-            pass
-            
-        self.log_to_console(f"Pi: {message}")
+        
+        # Regular text message, log to console
+        self.log_to_console(f"Pi: {msg.payload.decode()}")
+    
+    def _handle_sensor(self, data):
+        """Store MPU6050 readings and schedule a display update"""
+        self.accel_data = data.get("accelerometer", [0, 0, 0])
+        self.gyro_data = data.get("gyroscope", [0, 0, 0])
+        self.temp_data = data.get("temperature", 0)
+        
+        # Displays in both panels are updated on the next refresh tick
+        self._sensor_dirty = True
+    
+    def _handle_humiture(self, data):
+        """Store DHT11 readings and schedule a display update"""
+        self.humiture_data = data.get("data", {"temperature_c": 0, "humidity": 0})
+        self._humiture_dirty = True
+    
+    def _handle_spectral(self, data):
+        """Store spectral readings and schedule a display update"""
+        self.spectral_data = data.get("data", {})
+        self._spectral_dirty = True
+    
+    def _drain_ui(self):
+        """Redraw the sensor displays that received new data since the last tick"""
+        if self._sensor_dirty:
+            self._sensor_dirty = False
+            self.update_sensor_displays()
+        if self._humiture_dirty:
+            self._humiture_dirty = False
+            self.update_humiture_display()
+        if self._spectral_dirty:
+            self._spectral_dirty = False
+            self.update_spectral_display()
+        
+        # Schedule the next update
+        self.root.after(self.SENSOR_REFRESH_RATE, self._drain_ui)
     
     def update_sensor_displays(self):
         """Update all sensor displays with new values"""
@@ -290,7 +392,7 @@ class RoverControlApp:
             self.mqtt_connected = False
             self.log_to_console(f"Failed to connect to MQTT broker with code {rc}")
     
-    def on_mqtt_disconnect(self, client, userdata, rc):
+    def on_mqtt_disconnect(self, client, userdata, flags, rc, properties=None):
         """Callback for when the client disconnects from the MQTT broker"""
         self.mqtt_connected = False
         self.log_to_console("Disconnected from MQTT broker")
@@ -302,14 +404,14 @@ class RoverControlApp:
             return False
         
         try:
-            self.mqtt_client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
-            self.mqtt_client.on_message = self.on_mqtt_message
-            self.mqtt_client.on_connect = self.on_mqtt_connect
-            self.mqtt_client.on_disconnect = self.on_mqtt_disconnect
-            
             self.log_to_console(f"Connecting to MQTT broker at {ip_address}:{self.MQTT_PORT}")
+            # Connect synchronously so an unreachable or mistyped broker is
+            # reported to the caller; the network thread then serves the session
             self.mqtt_client.connect(ip_address, self.MQTT_PORT, 60)
-            self.mqtt_client.loop_start()
+            if not self._mqtt_loop_started:
+                threading.Thread(target=self._mqtt_network_loop, daemon=True).start()
+                self._mqtt_loop_started = True
+            self._mqtt_session.set()
             return True
         except Exception as e:
             self.log_to_console(f"MQTT connection error: {e}")
@@ -317,14 +419,29 @@ class RoverControlApp:
     
     def disconnect_mqtt(self):
         """Disconnect from the MQTT broker"""
-        if self.mqtt_client and self.mqtt_connected:
-            self.mqtt_client.loop_stop()
-            self.mqtt_client.disconnect()
-            self.mqtt_client = None
+        # The client object and its network thread are kept for the next connect_mqtt
+        self._mqtt_session.clear()
+        self.mqtt_client.disconnect()
+    
+    def _mqtt_network_loop(self):
+        """Run Paho's network loop for each session, on one thread for the app's lifetime
+        
+        loop_forever returns once disconnect() is called; the thread then waits
+        for the next connect_mqtt instead of exiting, so reconnects don't start
+        a new thread (or race the old one shutting down, as loop_start would).
+        """
+        while True:
+            self._mqtt_session.wait()
+            try:
+                self.mqtt_client.loop_forever()
+            except Exception as e:
+                # Keep the thread alive for this and later sessions
+                self.log_to_console(f"MQTT network loop error: {e}")
+                time.sleep(1)
     
     def log_to_console(self, message):
         """Add a message to the console with timestamp"""
-        if hasattr(self, 'console_panel') and self.console_panel:
+        if self.console_panel is not None:
             self.console_panel.log_message(message)
         else:
             print(message)  # Fallback in case console_panel is not ready
@@ -332,14 +449,46 @@ class RoverControlApp:
     def send_command(self, command):
         """Send a command via MQTT to the Raspberry Pi"""
         if self.mqtt_client and self.mqtt_connected:
-            self.mqtt_client.publish(self.TOPIC_SEND, command)
+            self._queue_message(command)
+            
+            # Never hold back a stop command
+            if command == "stop":
+                self._flush_tx()
+            
             self.log_to_console(f"Sent: {command}")
         else:
             self.log_to_console("Cannot send command: Not connected to MQTT broker")
     
+    def _queue_message(self, message):
+        """Buffer an outbound message and schedule a flush of the buffer"""
+        self._tx_buf.append(message)
+        if not self._tx_scheduled:
+            self._tx_scheduled = True
+            self.root.after(self.TX_BATCH_INTERVAL, self._flush_tx)
+    
+    def _flush_tx(self):
+        """Publish all buffered messages, as a single batch if there is more than one"""
+        self._tx_scheduled = False
+        if not self._tx_buf:
+            return
+        
+        messages = self._tx_buf
+        self._tx_buf = []
+        if not (self.mqtt_client and self.mqtt_connected):
+            return
+        
+        if len(messages) == 1:
+            # A lone command goes out as a plain string, a lone data packet as JSON
+            message = messages[0]
+            payload = message if isinstance(message, str) else json_codec.dumps(message)
+        else:
+            payload = json_codec.dumps({"type": "batch", "msgs": messages})
+        # Fire-and-forget; the result is not waited on
+        self.mqtt_client.publish(self.TOPIC_SEND, payload, qos=0, retain=False)
+    
     def get_apriltag_data(self):
         """Get the current AprilTag detection data"""
-        if hasattr(self, 'camera_panel') and self.camera_panel:
+        if self.camera_panel is not None:
             return self.camera_panel.current_tags
         return []
     
@@ -352,32 +501,25 @@ class RoverControlApp:
         if not tags:
             return
             
-        # Format tag data for sending
-        tag_data = []
-        for tag in tags:
-            tag_info = {
-                "id": tag.tag_id,
-                "center": tag.center.tolist(),
-                "corners": tag.corners.tolist(),
-            }
-            
-            # Add pose information if available
-            if hasattr(tag, 'pose_t') and hasattr(tag, 'pose_R'):
-                tag_info["distance"] = float(np.linalg.norm(tag.pose_t))
-                tag_info["translation"] = tag.pose_t.tolist()
-                tag_info["rotation"] = tag.pose_R.tolist()
-                
-            tag_data.append(tag_info)
-            
-        # Create a message with all tag data
+        # Pack each field for all tags into one array (struct of arrays) so the
+        # encoder streams contiguous data; numpy arrays are serialized directly by json_codec
         message = {
             "type": "apriltag_data",
-            "tags": tag_data
+            "ids": [tag.tag_id for tag in tags],
+            "centers": np.stack([tag.center for tag in tags]),
+            "corners": np.stack([tag.corners for tag in tags])
         }
         
-        # Send as JSON
-        self.mqtt_client.publish(self.TOPIC_SEND, json.dumps(message))
-        self.log_to_console(f"Sent AprilTag data: {len(tag_data)} tags")
+        # Add pose information if available for every tag
+        if all(tag.pose_t is not None and tag.pose_R is not None for tag in tags):
+            translations = np.stack([tag.pose_t.ravel() for tag in tags])
+            message["translations"] = translations
+            message["rotations"] = np.stack([tag.pose_R for tag in tags])
+            message["distances"] = np.linalg.norm(translations, axis=1)
+        
+        # Send as JSON with the next batch
+        self._queue_message(message)
+        self.log_to_console(f"Sent AprilTag data: {len(tags)} tags")
 
 if __name__ == "__main__":
     root = tk.Tk()
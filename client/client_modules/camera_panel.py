@@ -2,14 +2,26 @@ import tkinter as tk
 import cv2
 from PIL import Image, ImageTk
 import numpy as np
+import queue
+import threading
 import sys
 import os
 
 # Add lib directory to path so we can import our custom modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.apriltag_detector import AprilTagDetector
+from lib.apriltag_detector import DetectorWorker
+from lib.tk_helpers import configure_cached
 
 class CameraPanel:
+    # Frames wider than this are downscaled before AprilTag detection
+    DETECT_MAX_WIDTH = 640
+    
+    # Stream timeouts (milliseconds); the stream ends after STREAM_READ_RETRIES
+    # reads in a row time out, so a brief Wi-Fi stall doesn't turn the view off
+    STREAM_OPEN_TIMEOUT = 1000
+    STREAM_READ_TIMEOUT = 5000
+    STREAM_READ_RETRIES = 3
+    
     def __init__(self, parent, app):
         self.app = app
         self.frame = tk.Frame(parent)
@@ -44,11 +56,37 @@ class CameraPanel:
         self.camera_label = tk.Label(self.frame, bg="black", text="Camera Off", fg="white")
         self.camera_label.pack(fill=tk.BOTH, expand=True)
         
-        # Initialize AprilTag detector
-        self.tag_detector = AprilTagDetector()
+        # Initialize AprilTag detector; detection runs in its own process
+        self.tag_detector = DetectorWorker()
         
         # Current detection results (for external access)
         self.current_tags = []
+        self.tags_dirty = False  # Set when current_tags is replaced
+        
+        # Capture thread state; frames are handed to the UI through a single-slot queue
+        self._capture_thread = None
+        self._stopping_thread = None  # Stopped capture thread that may still be exiting
+        self._stop_event = None
+        self._frame_q = None
+        self._after_id = None
+        
+        # Preallocated BGR frame buffers cycled between the capture thread and the UI,
+        # and the single PhotoImage they are pasted into
+        self._free_bufs = None
+        self._photo = None
+        
+        # Grayscale detection buffer, only touched by the capture thread
+        self._gray_buf = None
+        
+        # Detection runs on every Nth captured frame, about twice per AprilTag
+        # display refresh (set from the stream FPS on start)
+        self._detect_every = 1
+        self._frames_since_submit = self._detect_every  # Detect on the first frame
+        self._last_tags = []
+        
+        # Plain copies of the Tk settings that the capture thread reads
+        self._detect_enabled = True
+        self._tag_size = 0.15
     
     def start_camera(self):
         """Start the camera stream to save bandwidth"""
@@ -64,8 +102,8 @@ class CameraPanel:
         self.start_stream(stream_url)
         
         # Update button states
-        self.start_camera_btn.config(state=tk.DISABLED)
-        self.stop_camera_btn.config(state=tk.NORMAL)
+        configure_cached(self.start_camera_btn, state=tk.DISABLED)
+        configure_cached(self.stop_camera_btn, state=tk.NORMAL)
     
     def stop_camera(self):
         """Stop the camera stream to save bandwidth"""
@@ -73,17 +111,32 @@ class CameraPanel:
         
         # Update button states if still connected
         if self.app.stream_active:
-            self.start_camera_btn.config(state=tk.NORMAL)
-            self.stop_camera_btn.config(state=tk.DISABLED)
+            configure_cached(self.start_camera_btn, state=tk.NORMAL)
+            configure_cached(self.stop_camera_btn, state=tk.DISABLED)
     
     def start_stream(self, url):
         """Start the MJPEG stream"""
+        # The previous capture thread shares the detector and detection buffers,
+        # so it must be gone before a new one starts (it exits after its current read)
+        if self._stopping_thread is not None:
+            self._stopping_thread.join(timeout=self.STREAM_READ_TIMEOUT / 1000 + 1)
+            if self._stopping_thread.is_alive():
+                self.camera_label.config(text="Previous stream is still closing, try again", fg="white")
+                return
+            self._stopping_thread = None
+        
         try:
-            self.app.capture = cv2.VideoCapture(url)
+            self.app.capture = self.open_capture(url)
             if not self.app.capture.isOpened():
                 self.camera_label.config(text="Failed to connect to stream", fg="white")
                 return
             
+            # The capture thread runs at the stream's frame rate, so the detection
+            # interval is counted in stream frames
+            stream_fps = self.app.capture.get(cv2.CAP_PROP_FPS) or 30
+            self._detect_every = max(1, round(stream_fps * self.app.APRILTAG_REFRESH_RATE / 1000 / 2))
+            self._frames_since_submit = self._detect_every
+            
             # Set camera parameters based on the actual frame size
             ret, test_frame = self.app.capture.read()
             #test_frame = cv2.resize(test_frame, (224, 224))
@@ -97,71 +150,210 @@ class CameraPanel:
                     tag_size=self.tag_size_var.get()  # tag size in meters
                 )
                 self.app.log_to_console(f"Camera initialized: {width}x{height}")
-                
-            self.camera_label.config(text="")
+            else:
+                height, width = 480, 640
+            
+            # One buffer being filled, one waiting in the queue and one being displayed
+            self._free_bufs = queue.Queue()
+            for _ in range(3):
+                self._free_bufs.put(np.empty((height, width, 3), dtype=np.uint8))
+            self._gray_buf = np.empty((height, width), dtype=np.uint8)
+            
+            # Create the display image once; later frames are pasted into it
+            self._photo = ImageTk.PhotoImage(image=Image.new("RGB", (width, height)))
+            self.camera_label.config(image=self._photo, text="")
+            self.camera_label.image = self._photo  # Keep reference to prevent garbage collection
+            
+            # Decode and detect on a worker thread; the Tk loop only displays results
+            self._stop_event = threading.Event()
+            self._frame_q = queue.Queue(maxsize=1)
+            self._capture_thread = threading.Thread(
+                target=self._capture_loop,
+                args=(self.app.capture, self._stop_event, self._frame_q, self._free_bufs),
+                daemon=True
+            )
+            self._capture_thread.start()
             self.update_frame()
         except Exception as e:
             self.camera_label.config(text=f"Error: {str(e)}", fg="white")
     
+    def open_capture(self, url):
+        """Open the MJPEG stream with the FFmpeg backend and low-latency settings"""
+        # Open/read timeouts must be given when opening; hardware decoding falls
+        # back to software if no accelerator is available
+        params = [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, self.STREAM_OPEN_TIMEOUT,
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC, self.STREAM_READ_TIMEOUT,
+            cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+        ]
+        capture = cv2.VideoCapture(url, cv2.CAP_FFMPEG, params)
+        if not capture.isOpened():
+            # Fall back to whichever backend OpenCV picks by default
+            capture = cv2.VideoCapture(url)
+        
+        # Keep OpenCV's internal buffer shallow so stale frames don't pile up
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return capture
+    
     def stop_stream(self):
         """Stop the MJPEG stream"""
-        if self.app.capture and self.app.capture.isOpened():
+        if self._after_id is not None:
+            self.app.root.after_cancel(self._after_id)
+            self._after_id = None
+        
+        if self._capture_thread is not None:
+            # The capture thread releases the capture itself once it exits;
+            # start_stream waits for it before starting another one
+            self._stop_event.set()
+            self._stopping_thread = self._capture_thread
+            self._capture_thread = None
+        elif self.app.capture and self.app.capture.isOpened():
             self.app.capture.release()
-            self.app.capture = None
-        self.camera_label.config(image=None, text="Camera Off", fg="white")
+        self.app.capture = None
+        
+        # Detach and release the display image (tkinter ignores image=None, so use "")
+        self.camera_label.config(image="", text="Camera Off", fg="white")
+        self.camera_label.image = None
+        self._photo = None
+    
+    def _capture_loop(self, capture, stop_event, frame_q, free_bufs):
+        """Read, convert and run AprilTag detection on frames (capture thread)"""
+        try:
+            while not stop_event.is_set():
+                # Wait for the UI to hand back a buffer to decode into
+                try:
+                    buf = free_bufs.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                
+                # The grab blocks until the next frame arrives, so the thread keeps
+                # pace with the stream and every frame is decoded
+                grabbed = capture.grab()
+                retries = 1
+                while not grabbed and retries < self.STREAM_READ_RETRIES and not stop_event.is_set():
+                    grabbed = capture.grab()
+                    retries += 1
+                # Decode straight into the buffer (OpenCV reallocates if the resolution changed)
+                ret, frame = capture.retrieve(buf) if grabbed else (False, None)
+                if not ret:
+                    # Signal the UI that the stream has ended
+                    self._put_latest(frame_q, None, free_bufs)
+                    break
+                
+                # Detect and visualize AprilTags; the frame stays in OpenCV's BGR order
+                frame, tags = self.detect_and_draw_apriltags(frame)
+                
+                self._put_latest(frame_q, (frame, tags), free_bufs)
+        except Exception as e:
+            print(f"Camera capture error: {e}")
+            self._put_latest(frame_q, None, free_bufs)
+        finally:
+            capture.release()
+    
+    @staticmethod
+    def _put_latest(frame_q, item, free_bufs):
+        """Replace whatever is waiting in the single-slot queue with item"""
+        try:
+            stale = frame_q.get_nowait()
+            if stale:
+                free_bufs.put(stale[0])  # Recycle the dropped frame's buffer
+        except queue.Empty:
+            pass
+        frame_q.put_nowait(item)
     
     def detect_and_draw_apriltags(self, frame):
-        """Detect AprilTags in the frame and draw info"""
-        if not self.apriltag_enabled.get():
-            return frame, []
+        """Detect AprilTags in the frame and draw info (capture thread)"""
+        if not self._detect_enabled:
+            if self._last_tags:
+                self._last_tags = []
+            return frame, self._last_tags
         
-        # Update tag size from UI input
-        self.tag_detector.camera_params['tag_size'] = self.tag_size_var.get()
+        # Pick up the worker's results once it has finished a frame
+        tags = self.tag_detector.poll()
+        if tags is not None:
+            self._last_tags = tags
         
-        # Detect tags
-        tags = self.tag_detector.detect(frame)
+        # Hand the detector a frame once N frames have passed and it is idle;
+        # in between, the last results are redrawn
+        self._frames_since_submit += 1
+        if self._frames_since_submit >= self._detect_every and not self.tag_detector.busy:
+            # Update tag size from UI input
+            self.tag_detector.set_tag_size(self._tag_size)
+            
+            # Convert to grayscale once, into the reused buffer, and hand that to the detector
+            # (cvtColor returns a new array if the resolution changed)
+            self._gray_buf = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+            
+            # Detect tags on a frame no wider than DETECT_MAX_WIDTH; poses are
+            # needed for the drawn axes and the tag panel's distances
+            self.tag_detector.submit(self._gray_buf, max_width=self.DETECT_MAX_WIDTH,
+                                     estimate_pose=True)
+            self._frames_since_submit = 0
         
         # Draw tags on frame
-        frame = self.tag_detector.draw_tags(frame, tags)
-        
-        # Store the current tags for potential external use
-        self.current_tags = tags
+        frame = self.tag_detector.draw_tags(frame, self._last_tags)
         
-        # Print tag info to console (if tags detected)
+        return frame, self._last_tags
+    
+    def log_detections(self, tags):
+        """Print tag info to console (if tags detected)"""
         if tags and len(tags) > 0:
             tag_info = []
             for tag in tags:
-                distance = np.linalg.norm(tag.pose_t) if hasattr(tag, 'pose_t') else "unknown"
+                distance = np.linalg.norm(tag.pose_t) if tag.pose_t is not None else "unknown"
                 tag_info.append(f"Tag ID: {tag.tag_id}, Distance: {distance}")
             
             tag_summary = ", ".join(tag_info)
             # Only log if we have new detections (to avoid spamming)
             self.app.log_to_console(f"AprilTag(s) detected: {tag_summary}")
-        
-        return frame, tags
     
     def update_frame(self):
-        """Update the camera frame"""
-        if self.app.capture and self.app.capture.isOpened():
-            ret, frame = self.app.capture.read()
-            if ret:
-                # Process and display the frame
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Detect and visualize AprilTags
-                frame, _ = self.detect_and_draw_apriltags(frame)
-                
-                image = Image.fromarray(frame)
-                photo = ImageTk.PhotoImage(image=image)
-                
-                self.camera_label.config(image=photo)
-                self.camera_label.image = photo  # Keep reference to prevent garbage collection
+        """Display the newest frame produced by the capture thread"""
+        self._after_id = None
+        if self._capture_thread is None:
+            return
+        
+        # Mirror the Tk settings into plain attributes for the capture thread
+        self._detect_enabled = self.apriltag_enabled.get()
+        try:
+            self._tag_size = self.tag_size_var.get()
+        except tk.TclError:
+            pass  # Entry is mid-edit, keep the previous tag size
+        
+        try:
+            result = self._frame_q.get_nowait()
+        except queue.Empty:
+            result = ()
+        
+        if result is None:
+            # If frame read failed, stop the stream
+            self.stop_stream()
+            if self.app.stream_active:
+                configure_cached(self.start_camera_btn, state=tk.NORMAL)
+                configure_cached(self.stop_camera_btn, state=tk.DISABLED)
+            return
+        
+        if result:
+            frame, tags = result
+            
+            # Store the current tags for potential external use (only when a new detection ran)
+            if tags is not self.current_tags:
+                self.current_tags = tags
+                self.tags_dirty = True
+                self.log_detections(tags)
             
-                # Schedule the next update using the configurable refresh rate
-                self.app.root.after(self.app.CAMERA_REFRESH_RATE, self.update_frame)
+            # Let PIL unpack the BGR bytes directly instead of converting to RGB first
+            height, width = frame.shape[:2]
+            image = Image.frombuffer("RGB", (width, height), frame, "raw", "BGR", frame.strides[0], 1)
+            if (self._photo.width(), self._photo.height()) == image.size:
+                self._photo.paste(image)
             else:
-                # If frame read failed, stop the stream
-                self.stop_stream()
-                if self.app.stream_active:
-                    self.start_camera_btn.config(state=tk.NORMAL)
-                    self.stop_camera_btn.config(state=tk.DISABLED)
+                self._photo = ImageTk.PhotoImage(image=image)
+                self.camera_label.config(image=self._photo)
+                self.camera_label.image = self._photo  # Keep reference to prevent garbage collection
+            
+            # The frame has been copied into the PhotoImage, so its buffer can be reused
+            self._free_bufs.put(frame)
+        
+        # Schedule the next update using the configurable refresh rate
+        self._after_id = self.app.root.after(self.app.CAMERA_REFRESH_RATE, self.update_frame)
@@ -1,6 +1,4 @@
 import tkinter as tk
-import json
-import os
 
 class ConnectionPanel:
     def __init__(self, parent, app):
@@ -27,33 +25,17 @@ class ConnectionPanel:
         self.connect_button.pack(fill=tk.X, padx=2, pady=2)
     
     def load_config(self):
-        """Load configuration from JSON file"""
-        try:
-            if os.path.exists(self.app.config_file):
-                with open(self.app.config_file, 'r') as f:
-                    config = json.load(f)
-                    if "ip_address" in config:
-                        self.ip_entry.insert(0, config["ip_address"])
-        except Exception as e:
-            print(f"Error loading config: {e}")
-            # Set default IP
-            #self.ip_entry.insert(0, "172.20.10.2")
+        """Load the saved IP address from the app's configuration"""
+        ip_address = self.app.config.get("ip_address")
+        if ip_address:
+            self.ip_entry.insert(0, ip_address)
     
     def save_config(self):
-        """Save configuration to JSON file"""
+        """Save the IP address to the configuration file"""
         try:
-            # Load existing config first to preserve other settings
-            config = {}
-            if os.path.exists(self.app.config_file):
-                with open(self.app.config_file, 'r') as f:
-                    config = json.load(f)
-            
-            # Update only the IP address
-            config["ip_address"] = self.ip_entry.get()
-            
-            # Save the updated config
-            with open(self.app.config_file, 'w') as f:
-                json.dump(config, f, indent=4)
+            # Update only the IP address; the rest of the cached config is preserved
+            self.app.config["ip_address"] = self.ip_entry.get()
+            self.app.persist_config()
                 
             # Give feedback to the user that save was successful
             self.save_ip_button.config(text="Saved!")
@@ -62,4 +44,4 @@ class ConnectionPanel:
             print(f"Error saving config: {e}")
             # Give feedback that save failed
             self.save_ip_button.config(text="Save Failed")
-            self.app.root.after(1000, lambda: self.save_ip_button.config(text="Save IP"))
+            self.app.root.after(1000, lambda: self.save_ip_button.config(text="Save IP"))
\ No newline at end of file
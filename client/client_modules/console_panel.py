@@ -1,7 +1,13 @@
 import tkinter as tk
-from datetime import datetime
+import collections
+import time
 
 class ConsolePanel:
+    # How long to collect messages before writing them to the widget (ms)
+    FLUSH_INTERVAL = 50
+    # Maximum number of lines kept in the console
+    MAX_LINES = 2000
+    
     def __init__(self, parent, app):
         self.app = app
         self.frame = tk.Frame(parent)
@@ -15,9 +21,42 @@ class ConsolePanel:
         self.console_text = tk.Text(self.frame, height=20, wrap=tk.WORD, yscrollcommand=scroll_y.set)
         self.console_text.pack(fill=tk.BOTH, expand=True)
         scroll_y.config(command=self.console_text.yview)
+        
+        # Lines waiting to be written, oldest dropped first if the UI falls behind
+        self._pending = collections.deque(maxlen=1000)
+        self._scheduled = False
+        
+        # Timestamp string for the current second, reused by every message logged in it
+        self._last_ts_bucket = 0
+        self._last_ts_str = ""
     
     def log_message(self, message):
         """Add a message to the console with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.console_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.console_text.see(tk.END)  # Auto-scroll to bottom
\ No newline at end of file
+        bucket = int(time.time())
+        if bucket != self._last_ts_bucket:
+            self._last_ts_str = time.strftime("%H:%M:%S", time.localtime(bucket))
+            self._last_ts_bucket = bucket
+        self._pending.append(f"[{self._last_ts_str}] {message}\n")
+        
+        # Write all messages logged within the flush interval in one go
+        if not self._scheduled:
+            self._scheduled = True
+            self.app.root.after(self.FLUSH_INTERVAL, self._flush)
+    
+    def _flush(self):
+        """Write pending messages to the console and trim old lines"""
+        self._scheduled = False
+        lines = []
+        while self._pending:
+            lines.append(self._pending.popleft())
+        if not lines:
+            return
+        
+        self.console_text.insert(tk.END, "".join(lines))
+        
+        # Drop the oldest lines once the console grows past MAX_LINES
+        line_count = int(self.console_text.index("end-1c").split(".")[0])
+        if line_count > self.MAX_LINES:
+            self.console_text.delete("1.0", f"{line_count - self.MAX_LINES + 1}.0")
+        
+        self.console_text.see(tk.END)  # Auto-scroll to bottom
@@ -1,4 +1,11 @@
 import tkinter as tk
+import sys
+import os
+from functools import partial
+
+# Add lib directory to path so we can import our custom modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.tk_helpers import configure_cached, configure_all_cached
 
 class ControlsPanel:
     def __init__(self, parent, app):
@@ -6,8 +13,8 @@ class ControlsPanel:
         self.frame = tk.LabelFrame(parent, text="Controls", padx=5, pady=5)
         self.frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Make the controls frame focusable
-        self.frame.configure(takefocus=1)
+        # Whether the grid frame (the only focusable part of the panel) has focus
+        self._focused = False
         
         # Create a grid for the keyboard-like layout
         # Define control commands for each button
@@ -32,55 +39,32 @@ class ControlsPanel:
         # Store original button colors for reset
         self.original_bg = None
         
-        # Row 0 (Top row): Q - W - E
-        btn_command = lambda cmd=self.control_commands["Humiture (Q)"]: self.app.send_command(cmd)
-        self.control_buttons["Humiture (Q)"] = tk.Button(
-            self.grid_frame, text="Q\nHumiture", command=btn_command, height=2, width=8, state=tk.DISABLED
-        )
-        self.control_buttons["Humiture (Q)"].grid(row=0, column=0, padx=2, pady=2)
-        
-        btn_command = lambda cmd=self.control_commands["Forward (W)"]: self.app.send_command(cmd)
-        self.control_buttons["Forward (W)"] = tk.Button(
-            self.grid_frame, text="W\nForward", command=btn_command, height=2, width=8, state=tk.DISABLED
-        )
-        self.control_buttons["Forward (W)"].grid(row=0, column=1, padx=2, pady=2)
-        
-        btn_command = lambda cmd=self.control_commands["Spectral (E)"]: self.app.send_command(cmd)
-        self.control_buttons["Spectral (E)"] = tk.Button(
-            self.grid_frame, text="E\nSpectral", command=btn_command, height=2, width=8, state=tk.DISABLED
-        )
-        self.control_buttons["Spectral (E)"].grid(row=0, column=2, padx=2, pady=2)
-        
-        # Row 1 (Middle row): A - S - D
-        btn_command = lambda cmd=self.control_commands["Left (A)"]: self.app.send_command(cmd)
-        self.control_buttons["Left (A)"] = tk.Button(
-            self.grid_frame, text="A\nLeft", command=btn_command, height=2, width=8, state=tk.DISABLED
-        )
-        self.control_buttons["Left (A)"].grid(row=1, column=0, padx=2, pady=2)
-        
-        btn_command = lambda cmd=self.control_commands["Backward (S)"]: self.app.send_command(cmd)
-        self.control_buttons["Backward (S)"] = tk.Button(
-            self.grid_frame, text="S\nBackward", command=btn_command, height=2, width=8, state=tk.DISABLED
-        )
-        self.control_buttons["Backward (S)"].grid(row=1, column=1, padx=2, pady=2)
-        
-        btn_command = lambda cmd=self.control_commands["Right (D)"]: self.app.send_command(cmd)
-        self.control_buttons["Right (D)"] = tk.Button(
-            self.grid_frame, text="D\nRight", command=btn_command, height=2, width=8, state=tk.DISABLED
-        )
-        self.control_buttons["Right (D)"].grid(row=1, column=2, padx=2, pady=2)
-        
-        # Row 2 (Bottom row): Other controls
-        stop_command = lambda: self._handle_stop()
-        self.control_buttons["Stop (X)"] = tk.Button(
-            self.grid_frame, text="X\nStop", command=stop_command, height=2, width=8, state=tk.DISABLED
-        )
-        self.control_buttons["Stop (X)"].grid(row=2, column=1, padx=2, pady=10)
+        # Grid positions and labels of the keyboard-like buttons:
+        # Row 0 (Top row): Q - W - E, Row 1 (Middle row): A - S - D, Row 2: Stop
+        button_layout = {
+            (0, 0): ("Humiture (Q)", "Q\nHumiture"),
+            (0, 1): ("Forward (W)", "W\nForward"),
+            (0, 2): ("Spectral (E)", "E\nSpectral"),
+            (1, 0): ("Left (A)", "A\nLeft"),
+            (1, 1): ("Backward (S)", "S\nBackward"),
+            (1, 2): ("Right (D)", "D\nRight"),
+            (2, 1): ("Stop (X)", "X\nStop"),
+        }
+        for (row, column), (name, text) in button_layout.items():
+            if name == "Stop (X)":
+                command = self._handle_stop
+            else:
+                command = partial(self.app.send_command, self.control_commands[name])
+            self.control_buttons[name] = tk.Button(
+                self.grid_frame, text=text, command=command, height=2, width=8, state=tk.DISABLED
+            )
+            self.control_buttons[name].grid(row=row, column=column, padx=2, pady=10 if row == 2 else 2)
         
         # Calibration button below the main controls
-        btn_command = lambda cmd=self.control_commands["Calibrate MPU6050"]: self.app.send_command(cmd)
         self.control_buttons["Calibrate MPU6050"] = tk.Button(
-            self.frame, text="Calibrate", command=btn_command, state=tk.DISABLED
+            self.frame, text="Calibrate",
+            command=partial(self.app.send_command, self.control_commands["Calibrate MPU6050"]),
+            state=tk.DISABLED
         )
         self.control_buttons["Calibrate MPU6050"].pack(fill=tk.X, padx=2, pady=2)
         
@@ -109,28 +93,86 @@ class ControlsPanel:
         self.grid_frame.configure(takefocus=1)
         self.grid_frame.bind("<Button-1>", lambda e: self.grid_frame.focus_set())
         
-        # Add key bindings to the grid frame
-        self.grid_frame.bind("w", lambda e: self.app.key_press_handler("Forward (W)"))
-        self.grid_frame.bind("a", lambda e: self.app.key_press_handler("Left (A)"))
-        self.grid_frame.bind("s", lambda e: self.app.key_press_handler("Backward (S)"))
-        self.grid_frame.bind("d", lambda e: self.app.key_press_handler("Right (D)"))
-        self.grid_frame.bind("q", lambda e: self.app.key_press_handler("Humiture (Q)"))
-        self.grid_frame.bind("e", lambda e: self.app.key_press_handler("Spectral (E)"))
-        self.grid_frame.bind("x", lambda e: self._handle_stop())
+        # Add a single key binding to the grid frame that dispatches through a table
+        self._key_map = {
+            "w": "Forward (W)",
+            "a": "Left (A)",
+            "s": "Backward (S)",
+            "d": "Right (D)",
+            "q": "Humiture (Q)",
+            "e": "Spectral (E)",
+            "x": "Stop (X)",
+        }
+        self.grid_frame.bind("<Key>", self._on_key)
         
         # Store original background color when initialized
         if not self.original_bg and len(self.control_buttons) > 0:
             first_button = next(iter(self.control_buttons.values()))
             self.original_bg = first_button.cget('background')
+        
+        # Names of buttons whose look currently differs from the default
+        self._dirty_buttons = set()
+        
+        # Key press handler for each button, built once with everything it needs captured
+        self.key_handlers = {name: self._make_key_handler(name) for name in self.control_buttons}
+    
+    def _make_key_handler(self, button_name):
+        """Build the handler that flashes a button and sends its command on key press"""
+        button = self.control_buttons[button_name]
+        command = self.control_commands[button_name]
+        original_bg = self.original_bg
+        flashing = False
+        
+        def restore():
+            nonlocal flashing
+            button.config(background=original_bg)
+            self._dirty_buttons.discard(button_name)
+            flashing = False
+        
+        def handler():
+            nonlocal flashing
+            if not self.app.mqtt_connected:
+                return
+            
+            # Flash the button for visual feedback, unless a flash is already
+            # in progress (e.g. from key autorepeat)
+            if not flashing:
+                flashing = True
+                button.config(background="yellow")
+                self._dirty_buttons.add(button_name)
+                self.app.root.after(100, restore)
+            
+            # Send the command associated with the key
+            self.app.send_command(command)
+        
+        return handler
+    
+    def set_key_map(self, key_map):
+        """Replace the {key: button name} table used by the key handler"""
+        self._key_map = dict(key_map)
+    
+    def _on_key(self, event):
+        """Dispatch a key press in the grid frame to its control"""
+        button_name = self._key_map.get(event.keysym.lower())
+        if button_name == "Stop (X)":
+            self._handle_stop()
+        elif button_name:
+            self.app.key_press_handler(button_name)
     
     def _on_focus_in(self, event):
         """Handle focus in event"""
+        if self._focused:
+            return
+        self._focused = True
         self.instruction_label.config(text="Keyboard controls ACTIVE", fg="green")
         self.focus_indicator.config(bg="green")
         self.frame.config(relief=tk.RAISED)
     
     def _on_focus_out(self, event):
         """Handle focus out event"""
+        if not self._focused:
+            return
+        self._focused = False
         instructions = "Click here to enable keyboard controls.\nW,A,S,D,Q,E keys work when this panel is selected."
         self.instruction_label.config(text=instructions, fg="blue")
         self.focus_indicator.config(bg="gray")
@@ -160,14 +202,14 @@ class ControlsPanel:
             else:
                 return
         
-        # Reset all buttons except Stop and Calibrate to original state
-        for button_name, button in self.control_buttons.items():
+        # Reset the buttons that were changed (never Stop or Calibrate) to original state
+        for button_name in self._dirty_buttons:
             if button_name != "Stop (X)" and button_name != "Calibrate MPU6050":
-                button.config(relief=tk.RAISED, bg=self.original_bg)
+                self.control_buttons[button_name].config(relief=tk.RAISED, bg=self.original_bg)
+        self._dirty_buttons.clear()
     
     def update_control_buttons(self, enabled):
         """Enable or disable control buttons based on connection status"""
         state = tk.NORMAL if enabled else tk.DISABLED
-        for button in self.control_buttons.values():
-            button.config(state=state)
-        self.deselect_button.config(state=tk.NORMAL)  # Always keep deselect button enabled
+        configure_all_cached(list(self.control_buttons.values()), state=state)
+        configure_cached(self.deselect_button, state=tk.NORMAL)  # Always keep deselect button enabled
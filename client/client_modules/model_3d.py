@@ -6,6 +6,8 @@ Highly laggy, since python threading isn't ACTUALLY multithreaded, so this modul
 import numpy as np
 import time
 import math
+import queue
+import threading
 import matplotlib
 matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
@@ -15,6 +17,45 @@ from mpl_toolkits.mplot3d import Axes3D
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import tkinter as tk
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        return lambda func: func
+
+@njit(cache=True)
+def complementary_filter(ax, ay, az, gx, gy, gz, roll, pitch, yaw, dt, alpha):
+    """
+    Blend integrated gyro rates (deg/s) with accelerometer tilt into a new (roll, pitch, yaw).
+    Plain scalar math so it can be compiled by Numba when it is installed.
+    """
+    # Convert gyro data from deg/s to rad/s
+    deg_to_rad = math.pi / 180.0
+    gx *= deg_to_rad
+    gy *= deg_to_rad
+    gz *= deg_to_rad
+    
+    # Calculate angles from accelerometer (roll and pitch)
+    accel_norm = math.sqrt(ax * ax + ay * ay + az * az)
+    if accel_norm > 0:  # Avoid division by zero
+        ax /= accel_norm
+        ay /= accel_norm
+        az /= accel_norm
+        roll_acc = math.atan2(ay, az)
+        pitch_acc = math.atan2(-ax, math.sqrt(ay * ay + az * az))
+    else:
+        roll_acc, pitch_acc = roll, pitch
+    
+    # Integrate gyro data; we can't determine yaw from accelerometer
+    new_roll = alpha * (roll + gx * dt) + (1 - alpha) * roll_acc
+    new_pitch = alpha * (pitch + gy * dt) + (1 - alpha) * pitch_acc
+    new_yaw = yaw + gz * dt
+    return new_roll, new_pitch, new_yaw
+
 class RoverVisualizer:
     """A class that creates and updates a 3D visualization of the rover using matplotlib."""
     
@@ -40,6 +81,20 @@ class RoverVisualizer:
         self.alpha = 0.98
         self.prev_time = time.time()
         
+        # Orientation integrated by the worker thread (roll, pitch, yaw in radians)
+        self._orientation = [0, 0, 0]
+        
+        # Redraw interval; orientation still integrates at the sensor rate
+        self._min_frame_dt = 1 / 30
+        
+        # Sensor samples handed to the worker thread, and the latest
+        # (accel, gyro, orientation) result it produced
+        self._in_q = queue.Queue(maxsize=2)
+        self._latest = None
+        self._drawn = None
+        self._stop_event = threading.Event()
+        self._after_id = None
+        
         # Create matplotlib figure and 3D axes for the visualization
         self.fig = Figure(figsize=(self.frame_width/100, self.frame_height/100), dpi=100)
         self.ax = self.fig.add_subplot(111, projection='3d')
@@ -66,10 +121,16 @@ class RoverVisualizer:
         
         # Store the rover parts for rotation
         self.rover_parts = []
+        self._R = np.empty((3, 3))
         
-        # Data smoothing buffers
-        self.accel_buffer = [[0, 0, 0] for _ in range(5)]
-        self.gyro_buffer = [[0, 0, 0] for _ in range(5)]
+        # Data smoothing buffers: circular windows plus their running sums
+        self.smoothing_window = 5
+        self.accel_buffer = np.zeros((self.smoothing_window, 3))
+        self.gyro_buffer = np.zeros((self.smoothing_window, 3))
+        self._accel_sum = np.zeros(3)
+        self._gyro_sum = np.zeros(3)
+        self._buffer_idx = 0
+        self._sample_count = 0  # Samples received, so a partly filled window isn't diluted
         
         # Initialize 3D rover model
         self.create_rover_model()
@@ -84,10 +145,23 @@ class RoverVisualizer:
         self.gyro_arrows[2] = self.ax.quiver(0, 0, 0, 0, 0, 0, color='purple', label='Gyro Z')
         
         # Add legend
-        self.ax.legend(loc='upper right')
+        self.ax.legend(loc='upper right', fontsize='small')
+        
+        # The rover and vectors are the only artists that change, so they are left out
+        # of full redraws and blitted on top of a saved background instead
+        self._dynamic_artists = self.rover_parts + [self.accel_arrow] + self.gyro_arrows
+        for artist in self._dynamic_artists:
+            artist.set_animated(True)
+        self._bg = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
         
         # Draw the initial view
         self.canvas.draw()
+        
+        # Do the filtering in a worker thread and poll its result from Tk
+        self._worker = threading.Thread(target=self._process_loop, daemon=True)
+        self._worker.start()
+        self._tick()
     
     def create_axes(self):
         """Create coordinate axes for reference."""
@@ -122,9 +196,16 @@ class RoverVisualizer:
         y = b * np.outer(np.sin(u), np.sin(v))
         z = c * np.outer(np.ones_like(u), np.cos(v))
         
-        # Plot rover body
-        self.rover_body = self.ax.plot_surface(x, y, z, color='cyan', alpha=0.7)
-        self.rover_parts.append(self.rover_body)
+        # The geometry never changes, so keep the reference-frame points as (N, 3)
+        # arrays that only need rotating each frame
+        self._body_shape = x.shape
+        self._body_pts = np.stack([x, y, z], axis=-1).reshape(-1, 3)
+        
+        # Vertex indices of the quads between neighbouring grid points of the surface
+        rows, cols = self._body_shape
+        i, j = np.meshgrid(np.arange(rows - 1), np.arange(cols - 1), indexing='ij')
+        corner = (i * cols + j).ravel()
+        self._body_faces = np.stack([corner, corner + 1, corner + cols + 1, corner + cols], axis=1)
         
         # Create gondola (cuboid) under the rover
         gondola_length, gondola_width, gondola_height = 0.8, 0.3, 0.2
@@ -140,323 +221,219 @@ class RoverVisualizer:
             -0.9, -0.9, -0.9, -0.9,
             -0.9-gondola_height, -0.9-gondola_height, -0.9-gondola_height, -0.9-gondola_height
         ])
-        
-        # Define the vertices of the gondola
-        vertices = [list(zip(x_g, y_g, z_g))]
-        
-        # Define the faces of the cuboid
-        faces = [
-            [vertices[0][0], vertices[0][1], vertices[0][2], vertices[0][3]],
-            [vertices[0][4], vertices[0][5], vertices[0][6], vertices[0][7]],
-            [vertices[0][0], vertices[0][3], vertices[0][7], vertices[0][4]],
-            [vertices[0][1], vertices[0][2], vertices[0][6], vertices[0][5]],
-            [vertices[0][0], vertices[0][1], vertices[0][5], vertices[0][4]],
-            [vertices[0][3], vertices[0][2], vertices[0][6], vertices[0][7]]
-        ]
-        
-        # Create the polygon collection
-        self.gondola = Poly3DCollection(faces, alpha=1.0, color='gray')
-        self.ax.add_collection3d(self.gondola)
-        self.rover_parts.append(self.gondola)
+        self._gondola_pts = np.column_stack([x_g, y_g, z_g])
+        
+        # Vertex indices of the faces of the cuboid
+        self._gondola_faces = np.array([
+            [0, 1, 2, 3],
+            [4, 5, 6, 7],
+            [0, 3, 7, 4],
+            [1, 2, 6, 5],
+            [0, 1, 5, 4],
+            [3, 2, 6, 7]
+        ])
         
         # Create fins for visual interest
-        # Right fin
-        x_fin_r = np.array([1.5, 0.5, 1.0])
-        y_fin_r = np.array([0, 0, 0])
-        z_fin_r = np.array([0.5, 0.5, 1.0])
-        
-        fin_r_vertices = [list(zip(x_fin_r, y_fin_r, z_fin_r))]
-        fin_r_faces = [[fin_r_vertices[0][0], fin_r_vertices[0][1], fin_r_vertices[0][2]]]
-        
-        self.fin_right = Poly3DCollection(fin_r_faces, alpha=0.7, color='cyan')
-        self.ax.add_collection3d(self.fin_right)
-        self.rover_parts.append(self.fin_right)
-        
-        # Left fin
-        x_fin_l = np.array([1.5, 0.5, 1.0])
-        y_fin_l = np.array([0, 0, 0])
-        z_fin_l = np.array([-0.5, -0.5, -1.0])
-        
-        fin_l_vertices = [list(zip(x_fin_l, y_fin_l, z_fin_l))]
-        fin_l_faces = [[fin_l_vertices[0][0], fin_l_vertices[0][1], fin_l_vertices[0][2]]]
-        
-        self.fin_left = Poly3DCollection(fin_l_faces, alpha=0.7, color='cyan')
-        self.ax.add_collection3d(self.fin_left)
-        self.rover_parts.append(self.fin_left)
+        self._fin_r_pts = np.array([[1.5, 0.0, 0.5], [0.5, 0.0, 0.5], [1.0, 0.0, 1.0]])
+        self._fin_l_pts = np.array([[1.5, 0.0, -0.5], [0.5, 0.0, -0.5], [1.0, 0.0, -1.0]])
+        
+        # Merge all parts into one mesh so each frame is a single rotation and a single
+        # collection to project and depth-sort. The triangular fins repeat their last
+        # vertex so every face is a quad.
+        parts = [
+            (self._body_pts, self._body_faces, (0.0, 1.0, 1.0, 0.7)),  # cyan
+            (self._gondola_pts, self._gondola_faces, (0.5, 0.5, 0.5, 1.0)),  # gray
+            (self._fin_r_pts, np.array([[0, 1, 2, 2]]), (0.0, 1.0, 1.0, 0.7)),
+            (self._fin_l_pts, np.array([[0, 1, 2, 2]]), (0.0, 1.0, 1.0, 0.7)),
+        ]
+        points, faces, colors = [], [], []
+        offset = 0
+        for part_pts, part_faces, color in parts:
+            points.append(part_pts)
+            faces.append(part_faces + offset)
+            colors.extend([color] * len(part_faces))
+            offset += len(part_pts)
+        self._model_pts = np.concatenate(points)
+        self._model_faces = np.concatenate(faces)
+        
+        # Create the collection once in the initial orientation; later frames only
+        # replace its vertices
+        self.rover_model = Poly3DCollection(self._model_pts[self._model_faces],
+                                            facecolors=colors, edgecolors=colors)
+        self.ax.add_collection3d(self.rover_model)
+        self.rover_parts.append(self.rover_model)
+    
+    def draw_rover_model(self, R):
+        """Move the rover mesh to the cached geometry rotated by the rotation matrix R."""
+        self.rover_model.set_verts((self._model_pts @ R.T)[self._model_faces])
+    
+    @staticmethod
+    def arrow_segments(vector, arrow_length_ratio=0.3):
+        """Return the shaft and head line segments of an arrow from the origin to vector."""
+        tip = np.asarray(vector, dtype=float)
+        length = np.linalg.norm(tip)
+        origin = np.zeros(3)
+        if length == 0:
+            return [np.array([origin, origin])] * 3
+        
+        # Bend the two head lines 30 degrees back from the tip in a plane containing the shaft
+        direction = tip / length
+        side = np.cross(direction, [0, 0, 1])
+        if np.linalg.norm(side) < 1e-6:
+            side = np.cross(direction, [1, 0, 0])
+        side /= np.linalg.norm(side)
+        head = length * arrow_length_ratio
+        back = direction * np.cos(np.pi / 6)
+        spread = side * np.sin(np.pi / 6)
+        return [
+            np.array([origin, tip]),
+            np.array([tip, tip - head * (back + spread)]),
+            np.array([tip, tip - head * (back - spread)]),
+        ]
     
     def update_data(self, accel, gyro):
         """
-        Update sensor data and calculate orientation.
+        Queue new sensor data for the worker thread, dropping the oldest sample if it is behind.
         
         Parameters:
             accel (list): Accelerometer data [x, y, z]
             gyro (list): Gyroscope data [x, y, z]
         """
-        # Apply smoothing using a simple moving average
-        self.accel_buffer.append(accel)
-        self.gyro_buffer.append(gyro)
-        
-        if len(self.accel_buffer) > 5:
-            self.accel_buffer.pop(0)
-        if len(self.gyro_buffer) > 5:
-            self.gyro_buffer.pop(0)
-            
-        # Calculate smoothed values
-        smoothed_accel = [sum(values) / len(values) for values in zip(*self.accel_buffer)]
-        smoothed_gyro = [sum(values) / len(values) for values in zip(*self.gyro_buffer)]
-        
-        # Store raw sensor data
-        self.sensor_data['accel'] = smoothed_accel
-        self.sensor_data['gyro'] = smoothed_gyro
+        while True:
+            try:
+                self._in_q.put_nowait((accel, gyro))
+                return
+            except queue.Full:
+                try:
+                    self._in_q.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def _process_loop(self):
+        """Worker thread: filter queued sensor samples until stopped."""
+        while not self._stop_event.is_set():
+            sample = self._in_q.get()
+            if sample is None:
+                break
+            self._process_sample(*sample)
+    
+    def _process_sample(self, accel, gyro):
+        """Smooth a sensor sample and calculate orientation (runs on the worker thread)."""
+        # Apply smoothing using a simple moving average: overwrite the oldest sample
+        # and adjust the running sums by the difference
+        idx = self._buffer_idx
+        self._accel_sum += np.subtract(accel, self.accel_buffer[idx])
+        self._gyro_sum += np.subtract(gyro, self.gyro_buffer[idx])
+        self.accel_buffer[idx] = accel
+        self.gyro_buffer[idx] = gyro
+        self._buffer_idx = (idx + 1) % self.smoothing_window
+        if self._sample_count < self.smoothing_window:
+            self._sample_count += 1
+        
+        # Calculate smoothed values over the samples actually received
+        smoothed_accel = self._accel_sum / self._sample_count
+        smoothed_gyro = self._gyro_sum / self._sample_count
         
         # Calculate orientation using complementary filter
         current_time = time.time()
         dt = current_time - self.prev_time
         self.prev_time = current_time
         
-        # Convert gyro data from deg/s to rad/s
-        gyro_rad = [g * np.pi / 180 for g in smoothed_gyro]
-        
-        # Calculate angles from accelerometer (roll and pitch)
-        accel_norm = np.linalg.norm(smoothed_accel)
-        if accel_norm > 0:  # Avoid division by zero
-            accel_normalized = [a / accel_norm for a in smoothed_accel]
-            
-            roll_acc = np.arctan2(accel_normalized[1], accel_normalized[2])
-            pitch_acc = np.arctan2(-accel_normalized[0], np.sqrt(accel_normalized[1]**2 + accel_normalized[2]**2))
-            
-            # We can't determine yaw from accelerometer
-            yaw_acc = self.sensor_data['orientation'][2]
-        else:
-            roll_acc, pitch_acc, yaw_acc = self.sensor_data['orientation']
-        
-        # Integrate gyro data
-        roll = self.alpha * (self.sensor_data['orientation'][0] + gyro_rad[0] * dt) + (1 - self.alpha) * roll_acc
-        pitch = self.alpha * (self.sensor_data['orientation'][1] + gyro_rad[1] * dt) + (1 - self.alpha) * pitch_acc
-        yaw = self.sensor_data['orientation'][2] + gyro_rad[2] * dt
-        
-        # Update orientation
-        self.sensor_data['orientation'] = [roll, pitch, yaw]
-        
-        # Update visualization
-        self.update_visualization()
+        roll, pitch, yaw = complementary_filter(
+            smoothed_accel[0], smoothed_accel[1], smoothed_accel[2],
+            smoothed_gyro[0], smoothed_gyro[1], smoothed_gyro[2],
+            self._orientation[0], self._orientation[1], self._orientation[2],
+            dt, self.alpha
+        )
+        
+        # Update orientation and publish the result as one tuple for the Tk side
+        self._orientation = [roll, pitch, yaw]
+        self._latest = (smoothed_accel, smoothed_gyro, self._orientation)
+    
+    def _tick(self):
+        """Redraw from the worker's latest result, if it changed, at the frame rate."""
+        latest = self._latest
+        if latest is not self._drawn:
+            self._drawn = latest
+            accel, gyro, orientation = latest
+            self.sensor_data['accel'] = accel
+            self.sensor_data['gyro'] = gyro
+            self.sensor_data['orientation'] = orientation
+            self.update_visualization()
+        self._after_id = self.tk_frame.after(int(self._min_frame_dt * 1000), self._tick)
     
     def update_visualization(self):
         """Update the 3D visualization based on the latest sensor data."""
-        # Clear previous vectors
-        if self.accel_arrow:
-            self.accel_arrow.remove()
-        for arrow in self.gyro_arrows:
-            if arrow:
-                arrow.remove()
-        
         # Get orientation and sensor data
         roll, pitch, yaw = self.sensor_data['orientation']
         accel = self.sensor_data['accel']
         gyro = self.sensor_data['gyro']
         
-        # Clear the axis to redraw the rover with new orientation
-        self.ax.cla()
-        
-        # Reset axes properties
-        self.ax.set_xlim(-3, 3)
-        self.ax.set_ylim(-3, 3)
-        self.ax.set_zlim(-3, 3)
-        self.ax.set_xlabel('X')
-        self.ax.set_ylabel('Y')
-        self.ax.set_zlabel('Z')
-        self.ax.set_title('Rover Orientation')
-        
-        # Equal aspect ratio
-        self.ax.set_box_aspect([1, 1, 1])
-        
-        # Recreate the axes
-        self.create_axes()
-        
-        # Recreate the rover model with updated orientation
+        # Move the rover model to the new orientation
         self.create_rotated_rover_model(roll, pitch, yaw)
         
-        # Create acceleration vector
+        # Update acceleration vector
         accel_scale = 0.2  # Scale factor for visualization
-        self.accel_arrow = self.ax.quiver(0, 0, 0, 
-                                        accel[0] * accel_scale,
-                                        accel[1] * accel_scale, 
-                                        accel[2] * accel_scale,
-                                        color='red', label='Accel')
+        self.accel_arrow.set_segments(self.arrow_segments(np.asarray(accel) * accel_scale))
         
-        # Create gyro vectors
+        # Update gyro vectors, each along its own axis
         gyro_scale = 0.05  # Scale factor for visualization
-        self.gyro_arrows[0] = self.ax.quiver(0, 0, 0, 
-                                         gyro[0] * gyro_scale, 0, 0,
-                                         color='blue', label='Gyro X')
-        self.gyro_arrows[1] = self.ax.quiver(0, 0, 0, 
-                                         0, gyro[1] * gyro_scale, 0,
-                                         color='green', label='Gyro Y')
-        self.gyro_arrows[2] = self.ax.quiver(0, 0, 0, 
-                                         0, 0, gyro[2] * gyro_scale,
-                                         color='purple', label='Gyro Z')
-        
-        # Add legend
-        self.ax.legend(loc='upper right', fontsize='small')
-        
-        # Redraw the canvas
-        self.canvas.draw()
+        for axis, arrow in enumerate(self.gyro_arrows):
+            vector = np.zeros(3)
+            vector[axis] = gyro[axis] * gyro_scale
+            arrow.set_segments(self.arrow_segments(vector))
+        
+        # Blit the changed artists over the saved background
+        if self._bg is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._bg)
+        self.draw_dynamic_artists()
+        self.canvas.blit(self.fig.bbox)
+    
+    def draw_dynamic_artists(self):
+        """Project and draw the animated artists onto the canvas."""
+        for artist in self._dynamic_artists:
+            artist.do_3d_projection()
+            self.ax.draw_artist(artist)
+    
+    def _on_draw(self, event):
+        """Save the static background after every full redraw (startup, resize, view rotation)."""
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_dynamic_artists()
     
     def create_rotated_rover_model(self, roll, pitch, yaw):
         """Create the rover model with the specified orientation."""
-        # Calculate rotation matrix
-        # First rotate around Z (yaw)
-        cos_yaw = np.cos(yaw)
-        sin_yaw = np.sin(yaw)
-        R_z = np.array([
-            [cos_yaw, -sin_yaw, 0],
-            [sin_yaw, cos_yaw, 0],
-            [0, 0, 1]
-        ])
-        
-        # Then rotate around Y (pitch)
-        cos_pitch = np.cos(pitch)
-        sin_pitch = np.sin(pitch)
-        R_y = np.array([
-            [cos_pitch, 0, sin_pitch],
-            [0, 1, 0],
-            [-sin_pitch, 0, cos_pitch]
-        ])
-        
-        # Then rotate around X (roll)
-        cos_roll = np.cos(roll)
-        sin_roll = np.sin(roll)
-        R_x = np.array([
-            [1, 0, 0],
-            [0, cos_roll, -sin_roll],
-            [0, sin_roll, cos_roll]
-        ])
-        
-        # Combined rotation matrix (ZYX order)
-        R = np.dot(R_z, np.dot(R_y, R_x))
-        
-        # Create the rover body (ellipsoid)
-        u = np.linspace(0, 2 * np.pi, 20)
-        v = np.linspace(0, np.pi, 10)
-        
-        # Ellipsoid parameters
-        a = 2.0  # Length (x-axis)
-        b = 0.8  # Width (y-axis)
-        c = 0.8  # Height (z-axis)
-        
-        # Generate ellipsoid points
-        x = a * np.outer(np.cos(u), np.sin(v))
-        y = b * np.outer(np.sin(u), np.sin(v))
-        z = c * np.outer(np.ones_like(u), np.cos(v))
-        
-        # Apply rotation to each point
-        x_rot = np.zeros_like(x)
-        y_rot = np.zeros_like(y)
-        z_rot = np.zeros_like(z)
-        
-        for i in range(x.shape[0]):
-            for j in range(x.shape[1]):
-                point = np.array([x[i,j], y[i,j], z[i,j]])
-                rotated = np.dot(R, point)
-                x_rot[i,j] = rotated[0]
-                y_rot[i,j] = rotated[1]
-                z_rot[i,j] = rotated[2]
-        
-        # Plot rover body
-        self.rover_body = self.ax.plot_surface(x_rot, y_rot, z_rot, color='cyan', alpha=0.7)
-        
-        # Create gondola (cuboid) under the rover
-        gondola_length, gondola_width, gondola_height = 0.8, 0.3, 0.2
-        x_g = np.array([
-            -gondola_length/2, gondola_length/2, gondola_length/2, -gondola_length/2,
-            -gondola_length/2, gondola_length/2, gondola_length/2, -gondola_length/2
-        ])
-        y_g = np.array([
-            -gondola_width/2, -gondola_width/2, gondola_width/2, gondola_width/2,
-            -gondola_width/2, -gondola_width/2, gondola_width/2, gondola_width/2
-        ])
-        z_g = np.array([
-            -0.9, -0.9, -0.9, -0.9,
-            -0.9-gondola_height, -0.9-gondola_height, -0.9-gondola_height, -0.9-gondola_height
-        ])
-        
-        # Apply rotation to each gondola point
-        x_g_rot = np.zeros_like(x_g)
-        y_g_rot = np.zeros_like(y_g)
-        z_g_rot = np.zeros_like(z_g)
-        
-        for i in range(len(x_g)):
-            point = np.array([x_g[i], y_g[i], z_g[i]])
-            rotated = np.dot(R, point)
-            x_g_rot[i] = rotated[0]
-            y_g_rot[i] = rotated[1]
-            z_g_rot[i] = rotated[2]
-        
-        # Define the vertices of the gondola
-        vertices = [list(zip(x_g_rot, y_g_rot, z_g_rot))]
-        
-        # Define the faces of the cuboid
-        faces = [
-            [vertices[0][0], vertices[0][1], vertices[0][2], vertices[0][3]],
-            [vertices[0][4], vertices[0][5], vertices[0][6], vertices[0][7]],
-            [vertices[0][0], vertices[0][3], vertices[0][7], vertices[0][4]],
-            [vertices[0][1], vertices[0][2], vertices[0][6], vertices[0][5]],
-            [vertices[0][0], vertices[0][1], vertices[0][5], vertices[0][4]],
-            [vertices[0][3], vertices[0][2], vertices[0][6], vertices[0][7]]
-        ]
-        
-        # Create the polygon collection
-        self.gondola = Poly3DCollection(faces, alpha=1.0, color='gray')
-        self.ax.add_collection3d(self.gondola)
-        
-        # Create fins for visual interest
-        # Right fin
-        x_fin_r = np.array([1.5, 0.5, 1.0])
-        y_fin_r = np.array([0, 0, 0])
-        z_fin_r = np.array([0.5, 0.5, 1.0])
-        
-        # Apply rotation to right fin
-        x_fin_r_rot = np.zeros_like(x_fin_r)
-        y_fin_r_rot = np.zeros_like(y_fin_r)
-        z_fin_r_rot = np.zeros_like(z_fin_r)
-        
-        for i in range(len(x_fin_r)):
-            point = np.array([x_fin_r[i], y_fin_r[i], z_fin_r[i]])
-            rotated = np.dot(R, point)
-            x_fin_r_rot[i] = rotated[0]
-            y_fin_r_rot[i] = rotated[1]
-            z_fin_r_rot[i] = rotated[2]
-        
-        fin_r_vertices = [list(zip(x_fin_r_rot, y_fin_r_rot, z_fin_r_rot))]
-        fin_r_faces = [[fin_r_vertices[0][0], fin_r_vertices[0][1], fin_r_vertices[0][2]]]
-        
-        self.fin_right = Poly3DCollection(fin_r_faces, alpha=0.7, color='cyan')
-        self.ax.add_collection3d(self.fin_right)
-        
-        # Left fin
-        x_fin_l = np.array([1.5, 0.5, 1.0])
-        y_fin_l = np.array([0, 0, 0])
-        z_fin_l = np.array([-0.5, -0.5, -1.0])
-        
-        # Apply rotation to left fin
-        x_fin_l_rot = np.zeros_like(x_fin_l)
-        y_fin_l_rot = np.zeros_like(y_fin_l)
-        z_fin_l_rot = np.zeros_like(z_fin_l)
-        
-        for i in range(len(x_fin_l)):
-            point = np.array([x_fin_l[i], y_fin_l[i], z_fin_l[i]])
-            rotated = np.dot(R, point)
-            x_fin_l_rot[i] = rotated[0]
-            y_fin_l_rot[i] = rotated[1]
-            z_fin_l_rot[i] = rotated[2]
-        
-        fin_l_vertices = [list(zip(x_fin_l_rot, y_fin_l_rot, z_fin_l_rot))]
-        fin_l_faces = [[fin_l_vertices[0][0], fin_l_vertices[0][1], fin_l_vertices[0][2]]]
-        
-        self.fin_left = Poly3DCollection(fin_l_faces, alpha=0.7, color='cyan')
-        self.ax.add_collection3d(self.fin_left)
+        # Rotation matrix for ZYX order (yaw, then pitch, then roll), written out
+        # element by element into a reused buffer
+        cr, sr = math.cos(roll), math.sin(roll)
+        cp, sp = math.cos(pitch), math.sin(pitch)
+        cy, sy = math.cos(yaw), math.sin(yaw)
+        R = self._R
+        R[0, 0] = cy * cp
+        R[0, 1] = cy * sp * sr - sy * cr
+        R[0, 2] = cy * sp * cr + sy * sr
+        R[1, 0] = sy * cp
+        R[1, 1] = sy * sp * sr + cy * cr
+        R[1, 2] = sy * sp * cr - cy * sr
+        R[2, 0] = -sp
+        R[2, 1] = cp * sr
+        R[2, 2] = cp * cr
+        
+        # Draw the cached geometry with the updated orientation
+        self.draw_rover_model(R)
     
     def stop(self):
         """Clean up resources when stopping the visualization."""
+        # Stop polling and wake the worker so it exits
+        if self._after_id is not None:
+            self.tk_frame.after_cancel(self._after_id)
+            self._after_id = None
+        self._stop_event.set()
+        try:
+            self._in_q.put_nowait(None)
+        except queue.Full:
+            pass
+        
         # Close the matplotlib figure to free resources
         plt.close(self.fig)
\ No newline at end of file
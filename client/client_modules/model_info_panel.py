@@ -1,6 +1,17 @@
 import tkinter as tk
+import collections
+import numpy as np
+import sys
+import os
+
+# Add lib directory to path so we can import our custom modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.tk_helpers import configure_cached
 
 class AprilTagPanel:
+    # Maximum number of tags remembered; the least recently seen are dropped first
+    MAX_TAGS = 128
+    
     def __init__(self, parent, app):
         self.app = app
         
@@ -23,37 +34,73 @@ class AprilTagPanel:
         self.scrollbar.config(command=self.tags_listbox.yview)
         
         # Status label
-        self.status_label = tk.Label(self.tags_frame, text="No tags detected")
+        self.status_label = tk.Label(self.tags_frame)
         self.status_label.pack(fill=tk.X)
+        configure_cached(self.status_label, text="No tags detected")
         
-        # Dictionary to keep track of detected tags
-        self.detected_tags_dict = {}
+        # Dictionary to keep track of detected tags, most recently seen last
+        self.detected_tags_dict = collections.OrderedDict()
+        self._rows_dirty = False
+        
+        # Sorted (tag_id, info) rows currently shown in the listbox
+        self._rendered = []
     
     def update_tags_display(self, tags):
         """Update the tags display with the list of detected AprilTags"""
         if not tags:
-            self.status_label.config(text="No tags detected")
+            configure_cached(self.status_label, text="No tags detected")
             return
             
+        # Gather the Z-distances of all tags and round them in one go
+        # (NaN where no pose was estimated)
+        distances = np.fromiter(
+            (tag.pose_t.flat[2] if getattr(tag, 'pose_t', None) is not None else np.nan for tag in tags),
+            dtype=np.float64, count=len(tags)
+        )
+        distances = np.round(distances, 2).tolist()
+        
         # Update our dictionary of detected tags
-        for tag in tags:
-            tag_id = tag.tag_id
-            distance = None
-            
-            # Get distance if available
-            if hasattr(tag, 'pose_t'):
-                distance = float(round(float(tag.pose_t[2]), 2))  # Z-distance
-                
-            tag_info = f"ID: {tag_id}"
-            if distance is not None:
-                tag_info += f" - Distance: {distance}m"
-                
-            self.detected_tags_dict[tag_id] = tag_info
+        for tag, distance in zip(tags, distances):
+            if distance == distance:  # not NaN
+                tag_info = f"ID: {tag.tag_id} - Distance: {distance}m"
+            else:
+                tag_info = f"ID: {tag.tag_id}"
+            if self.detected_tags_dict.get(tag.tag_id) != tag_info:
+                self.detected_tags_dict[tag.tag_id] = tag_info
+                self._rows_dirty = True
+            self.detected_tags_dict.move_to_end(tag.tag_id)
+        
+        # Forget the least recently seen tags beyond MAX_TAGS
+        while len(self.detected_tags_dict) > self.MAX_TAGS:
+            self.detected_tags_dict.popitem(last=False)
+            self._rows_dirty = True
             
-        # Update listbox with all detected tags
-        self.tags_listbox.delete(0, tk.END)
-        for tag_id, info in sorted(self.detected_tags_dict.items()):
-            self.tags_listbox.insert(tk.END, info)
+        # Update listbox with only the rows that changed
+        if self._rows_dirty:
+            self._rows_dirty = False
+            rows = sorted(self.detected_tags_dict.items())
+            if rows != self._rendered:
+                self._update_listbox(rows)
             
         # Update status
-        self.status_label.config(text=f"{len(self.detected_tags_dict)} unique tags detected")
\ No newline at end of file
+        configure_cached(self.status_label, text=f"{len(self.detected_tags_dict)} unique tags detected")
+    
+    def _update_listbox(self, rows):
+        """Walk the old and new sorted rows together, deleting and inserting only the differences"""
+        old = self._rendered
+        j = 0
+        for index, (tag_id, info) in enumerate(rows):
+            # Rows whose tag no longer exists
+            while j < len(old) and old[j][0] < tag_id:
+                self.tags_listbox.delete(index)
+                j += 1
+            if j < len(old) and old[j][0] == tag_id:
+                if old[j][1] != info:
+                    self.tags_listbox.delete(index)
+                    self.tags_listbox.insert(index, info)
+                j += 1
+            else:
+                self.tags_listbox.insert(index, info)
+        if j < len(old):
+            self.tags_listbox.delete(len(rows), tk.END)
+        self._rendered = rows
\ No newline at end of file
@@ -7,55 +7,99 @@ class SensorPanel:
         self.frame = tk.LabelFrame(parent, text="Sensor Data", padx=5, pady=5)
         self.frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Create a grid layout for sensor data
-        sensor_grid = tk.Frame(self.frame)
-        sensor_grid.pack(fill=tk.BOTH, expand=True)
-        
-        # Accelerometer labels
-        tk.Label(sensor_grid, text="Accelerometer:", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky="w", padx=5, pady=2)
-        self.accel_labels = []
-        for i, axis in enumerate(['X', 'Y', 'Z']):
-            tk.Label(sensor_grid, text=f"{axis}:").grid(row=i+1, column=0, sticky="e", padx=5, pady=2)
-            label = tk.Label(sensor_grid, text="0.00 m/s²", width=10)
-            label.grid(row=i+1, column=1, sticky="w", padx=5, pady=2)
-            self.accel_labels.append(label)
-        
-        # Gyroscope labels
-        tk.Label(sensor_grid, text="Gyroscope:", font=("Arial", 10, "bold")).grid(row=0, column=2, sticky="w", padx=5, pady=2)
-        self.gyro_labels = []
-        for i, axis in enumerate(['X', 'Y', 'Z']):
-            tk.Label(sensor_grid, text=f"{axis}:").grid(row=i+1, column=2, sticky="e", padx=5, pady=2)
-            label = tk.Label(sensor_grid, text="0.00 rad/s", width=10)
-            label.grid(row=i+1, column=3, sticky="w", padx=5, pady=2)
-            self.gyro_labels.append(label)
-            
-        # Temperature label
-        tk.Label(sensor_grid, text="MPU Temp:", font=("Arial", 10, "bold")).grid(row=4, column=0, sticky="w", padx=5, pady=2)
-        self.temp_label = tk.Label(sensor_grid, text="0.00 °C", width=10)
-        self.temp_label.grid(row=4, column=1, sticky="w", padx=5, pady=2)
-
-        # Humidity label
-        tk.Label(sensor_grid, text="Humidity:", font=("Arial", 10, "bold")).grid(row=4, column=2, sticky="w", padx=5, pady=2)
-        self.humidity_label = tk.Label(sensor_grid, text="0.00 %", width=10)
-        self.humidity_label.grid(row=4, column=3, sticky="w", padx=5, pady=2)
-
-        # DHT11 Temperature label
-        tk.Label(sensor_grid, text="DHT11 Temp:", font=("Arial", 10, "bold")).grid(row=5, column=0, sticky="w", padx=5, pady=2)
-        self.dht11_temp_label = tk.Label(sensor_grid, text="0.00 °C", width=10)
-        self.dht11_temp_label.grid(row=5, column=1, sticky="w", padx=5, pady=2)
+        # A single Treeview shows every reading, in two (name, value) column pairs
+        # like a grid so all readings fit the short bottom pane; an update
+        # touches one widget instead of a grid of labels
+        columns = ("name_left", "value_left", "name_right", "value_right")
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="", height=5, selectmode="none")
+        # Sized to fit the ~300 px bottom pane; the value columns take any extra width
+        for column in columns:
+            self.tree.column(column, width=70, minwidth=60, anchor="w",
+                             stretch=column.startswith("value"))
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        
+        # (row iid, left reading, right reading); each reading is (key, name, initial value)
+        rows = [
+            ("x", ("ax", "Accel X", "0.00 m/s²"), ("gx", "Gyro X", "0.00 rad/s")),
+            ("y", ("ay", "Accel Y", "0.00 m/s²"), ("gy", "Gyro Y", "0.00 rad/s")),
+            ("z", ("az", "Accel Z", "0.00 m/s²"), ("gz", "Gyro Z", "0.00 rad/s")),
+            ("t", ("temp", "MPU Temp", "0.00 °C"), ("hum", "Humidity", "0.00 %")),
+            ("d", ("dht", "DHT11 Temp", "0.00 °C"), None),
+        ]
+        
+        # Tree cell (row iid, value column) of each reading, and the last text
+        # shown in it, to skip unchanged values
+        self._cells = {}
+        self._row_text = {}
+        for iid, left, right in rows:
+            values = []
+            for reading, value_column in ((left, "value_left"), (right, "value_right")):
+                if reading is None:
+                    values += ["", ""]
+                    continue
+                key, name, value = reading
+                values += [name, value]
+                self._cells[key] = (iid, value_column)
+                self._row_text[key] = value
+            self.tree.insert("", tk.END, iid=iid, values=values)
+        
+        self._accel_rows = ("ax", "ay", "az")
+        self._gyro_rows = ("gx", "gy", "gz")
+        
+        # Bound formatters for the row text, looked up once
+        self._fmt_accel = "{:.2f} m/s²".format
+        self._fmt_gyro = "{:.2f} rad/s".format
+        self._fmt_temp = "{:.2f} °C".format
+        self._fmt_hum = "{:.2f} %".format
+        
+        # Latest values waiting to be shown; only the newest survives until the next idle
+        self._pending_sensor = None
+        self._pending_humiture = None
+        self._scheduled = False
     
     def update_sensor_displays(self, accel, gyro, temp):
         """Update all sensor displays with new values"""
-        # Update the compact display in the bottom right
-        for i, value in enumerate(accel):
-            self.accel_labels[i].config(text=f"{value:.2f} m/s²")
-        
-        for i, value in enumerate(gyro):
-            self.gyro_labels[i].config(text=f"{value:.2f} rad/s")
-        
-        self.temp_label.config(text=f"{temp:.2f} °C")
+        self._pending_sensor = (accel, gyro, temp)
+        self._schedule_flush()
 
     def update_humiture_display(self, temp, humidity):
         """Update humiture sensor displays with new values"""
-        self.dht11_temp_label.config(text=f"{temp:.2f} °C")
-        self.humidity_label.config(text=f"{humidity:.2f} %")
+        self._pending_humiture = (temp, humidity)
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """Apply the pending values once Tk is idle, dropping any superseded in between"""
+        if not self._scheduled:
+            self._scheduled = True
+            self.app.root.after_idle(self._flush)
+    
+    def _flush(self):
+        """Show the latest pending values"""
+        self._scheduled = False
+        if self._pending_sensor is not None:
+            self._apply_sensor_displays(*self._pending_sensor)
+            self._pending_sensor = None
+        if self._pending_humiture is not None:
+            self._apply_humiture_display(*self._pending_humiture)
+            self._pending_humiture = None
+    
+    def _set_row(self, key, text):
+        """Set a reading's value, skipping the Tcl call if it is unchanged"""
+        if self._row_text[key] != text:
+            self._row_text[key] = text
+            self.tree.set(*self._cells[key], text)
+    
+    def _apply_sensor_displays(self, accel, gyro, temp):
+        """Write sensor values to the rows"""
+        for iid, value in zip(self._accel_rows, accel):
+            self._set_row(iid, self._fmt_accel(value))
+        
+        for iid, value in zip(self._gyro_rows, gyro):
+            self._set_row(iid, self._fmt_gyro(value))
+        
+        self._set_row("temp", self._fmt_temp(temp))
+
+    def _apply_humiture_display(self, temp, humidity):
+        """Write humiture values to the rows"""
+        self._set_row("dht", self._fmt_temp(temp))
+        self._set_row("hum", self._fmt_hum(humidity))
@@ -1,5 +1,26 @@
 import tkinter as tk
 from tkinter import ttk
+import sys
+import os
+
+# Add lib directory to path so we can import our custom modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.tk_helpers import configure_cached
+
+# Colors of the spectral sensor channels, in display order
+SPECTRAL_COLORS = ("violet", "blue", "green", "yellow", "orange", "red")
+
+# Whether the colored progress bar styles have been registered with ttk
+_STYLES_INITIALIZED = False
+
+def _init_spectral_styles():
+    """Register a colored progress bar style for each spectral channel, once"""
+    global _STYLES_INITIALIZED
+    if not _STYLES_INITIALIZED:
+        style = ttk.Style()
+        for color in SPECTRAL_COLORS:
+            style.configure(f"{color}.Horizontal.TProgressbar", background=color)
+        _STYLES_INITIALIZED = True
 
 class SensorTabPanel:
     def __init__(self, parent, app):
@@ -8,6 +29,7 @@ class SensorTabPanel:
         # Make main frame fill the entire area
         sensor_frame = tk.Frame(parent, padx=5, pady=5)
         sensor_frame.pack(fill=tk.BOTH, expand=True)
+        self.frame = sensor_frame
         
         # Title - more compact
         title_label = tk.Label(sensor_frame, text="MPU6050 Sensor Data", font=("Arial", 12, "bold"))
@@ -82,10 +104,10 @@ class SensorTabPanel:
 
         self.spectral_bars = {}
         self.spectral_val_labels = {}
-        colors = ["violet", "blue", "green", "yellow", "orange", "red"]
+        colors = SPECTRAL_COLORS
         
         # Create custom styles for progress bars
-        style = ttk.Style()
+        _init_spectral_styles()
 
         for i, color in enumerate(colors):
             tk.Label(spectral_frame, text=f"{color.capitalize()}:", font=("Arial", 10)).grid(row=i, column=0, sticky="w", pady=2, padx=20)
@@ -93,40 +115,92 @@ class SensorTabPanel:
             val_label.grid(row=i, column=1, padx=5)
             self.spectral_val_labels[color] = val_label
 
-            # Create a custom style for each color
-            style.configure(f"{color}.Horizontal.TProgressbar", background=color)
-
             bar = ttk.Progressbar(spectral_frame, length=300, mode="determinate", style=f"{color}.Horizontal.TProgressbar")
             bar["maximum"] = 60000  # Max value from sensor
             bar["value"] = 0
             bar.grid(row=i, column=2, padx=2, pady=2)
             self.spectral_bars[color] = bar
+        
+        # (color, value label, bar) rows in display order for the update path
+        self._spectral_rows = tuple(
+            (color, self.spectral_val_labels[color], self.spectral_bars[color]) for color in colors
+        )
+        
+        # (value label, bar) pairs for the accelerometer then gyroscope axes
+        self._axis_rows = tuple(zip(self.accel_val_labels + self.gyro_val_labels,
+                                    self.accel_bars + self.gyro_bars))
+        self._last_reading = None
+        
+        # Bound formatters for the value labels, looked up once
+        self._fmt2 = "{:.2f}".format
+        self._fmt3 = "{:.3f}".format
+        
+        # Latest values waiting to be shown; only the newest survives until the next idle
+        self._pending_sensor = None
+        self._pending_spectral = None
+        self._scheduled = False
+        
+        # Values arriving while the tab is hidden are held until it is shown again.
+        # The notebook maps and unmaps the tab page (parent), not this frame
+        parent.bind("<Map>", lambda e: self._schedule_flush(), add="+")
 
     def update_display(self, accel, gyro, temp):
         """Update the detailed sensor tab display with new values"""
-        # Update the accelerometer display
-        for i, value in enumerate(accel):
-            self.accel_val_labels[i].config(text=f"{value:.2f}")
-            # Map value to progress bar (center at 10, range -10 to +10)
-            bar_value = min(max(value + 10, 0), 20)
-            self.accel_bars[i]["value"] = bar_value
+        self._pending_sensor = (accel, gyro, temp)
+        self._schedule_flush()
+
+    def update_spectral_display(self, spectral_data):
+        """Update the spectral sensor display with new values"""
+        self._pending_spectral = spectral_data
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """Apply the pending values once Tk is idle, dropping any superseded in between"""
+        if not self._scheduled:
+            self._scheduled = True
+            self.app.root.after_idle(self._flush)
+    
+    def _flush(self):
+        """Show the latest pending values"""
+        self._scheduled = False
+        # winfo_viewable is false once any ancestor (the tab page) is unmapped
+        if not self.frame.winfo_viewable():
+            return
+        if self._pending_sensor is not None:
+            self._apply_display(*self._pending_sensor)
+            self._pending_sensor = None
+        if self._pending_spectral is not None:
+            self._apply_spectral_display(self._pending_spectral)
+            self._pending_spectral = None
+    
+    def _apply_display(self, accel, gyro, temp):
+        """Write sensor values to the labels and bars"""
+        # Skip the whole update if the reading is identical to the last one shown
+        reading = (tuple(accel), tuple(gyro), temp)
+        if reading == self._last_reading:
+            return
+        self._last_reading = reading
         
-        # Update the gyroscope display
-        for i, value in enumerate(gyro):
-            self.gyro_val_labels[i].config(text=f"{value:.2f}")
+        # Update the accelerometer and gyroscope displays; labels and bars whose
+        # value hasn't changed are skipped
+        for (val_label, bar), value in zip(self._axis_rows, reading[0] + reading[1]):
+            configure_cached(val_label, text=self._fmt2(value))
             # Map value to progress bar (center at 10, range -10 to +10)
-            bar_value = min(max(value + 10, 0), 20)
-            self.gyro_bars[i]["value"] = bar_value
+            bar_value = value + 10
+            bar_value = 0 if bar_value < 0 else 20 if bar_value > 20 else bar_value
+            configure_cached(bar, value=bar_value)
         
         # Update the temperature display
-        self.temp_val_label.config(text=f"{temp:.2f}")
+        configure_cached(self.temp_val_label, text=self._fmt2(temp))
         # Map temperature to range (0 to 60°C)
-        bar_value = min(max(temp, 0), 60)
-        self.temp_bar["value"] = bar_value
+        bar_value = 0 if temp < 0 else 60 if temp > 60 else temp
+        configure_cached(self.temp_bar, value=bar_value)
 
-    def update_spectral_display(self, spectral_data):
-        """Update the spectral sensor display with new values"""
-        for color, value in spectral_data.items():
-            if color in self.spectral_val_labels:
-                self.spectral_val_labels[color].config(text=f"{value:.3f}")
-                self.spectral_bars[color]["value"] = value
\ No newline at end of file
+    def _apply_spectral_display(self, spectral_data):
+        """Write spectral values to the labels and bars"""
+        get = spectral_data.get
+        for color, val_label, bar in self._spectral_rows:
+            value = get(color)
+            if value is not None:
+                configure_cached(val_label, text=self._fmt3(value))
+                configure_cached(bar, value=value)
@@ -1,7 +1,38 @@
 import tkinter as tk
 from tkinter import ttk
-import json
-import os
+
+# Default key for each control action
+_DEFAULT_BINDINGS = {
+    "Forward": "w",
+    "Backward": "s",
+    "Left": "a",
+    "Right": "d",
+    "Spectral": "e",
+    "Humiture": "q",
+    "Stop": "x"
+}
+
+# Description shown next to each action's key binding
+_ACTION_DESCRIPTIONS = {
+    "Forward": "Move rover forward",
+    "Backward": "Move rover backward",
+    "Left": "Turn rover left",
+    "Right": "Turn rover right",
+    "Spectral": "Take spectral reading",
+    "Humiture": "Take humiture reading",
+    "Stop": "Stop all motion"
+}
+
+# Controls panel button triggered by each action
+_ACTION_TO_BUTTON = {
+    "Forward": "Forward (W)",
+    "Backward": "Backward (S)",
+    "Left": "Left (A)",
+    "Right": "Right (D)",
+    "Spectral": "Spectral (E)",
+    "Humiture": "Humiture (Q)",
+    "Stop": "Stop (X)"
+}
 
 class SettingsPanel:
     def __init__(self, parent, app):
@@ -14,10 +45,10 @@ class SettingsPanel:
         scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = ttk.Frame(self.canvas)
         
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        # Recompute the scroll region at most once per idle, however many
+        # <Configure> events a resize produces
+        self._scroll_scheduled = False
+        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
         
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=scrollbar.set)
@@ -31,20 +62,14 @@ class SettingsPanel:
         self.canvas.bind("<Button-5>", self._on_mousewheel)             # Linux scroll down
         
         # Initialize settings
-        self.key_bindings = {
-            "Forward": "w",
-            "Backward": "s",
-            "Left": "a",
-            "Right": "d",
-            "Spectral": "e",
-            "Humiture": "q",
-            "Stop": "x"
-        }
+        self.key_bindings = dict(_DEFAULT_BINDINGS)
         
-        self.mqtt_port = tk.StringVar(value="1883")
-        self.camera_port = tk.StringVar(value="7123")
-        self.camera_refresh_rate = tk.StringVar(value="10")
-        self.sensor_refresh_rate = tk.StringVar(value="100")
+        # Initial text of the numeric setting entries (the entries themselves
+        # are read on save, so no Tcl variables are needed)
+        self.mqtt_port = "1883"
+        self.camera_port = "7123"
+        self.camera_refresh_rate = "10"
+        self.sensor_refresh_rate = "100"
         
         # Load settings if exist
         self.load_settings()
@@ -52,6 +77,19 @@ class SettingsPanel:
         # Create the settings UI
         self.create_settings_ui()
         
+    def _on_frame_configure(self, event):
+        """Schedule a scroll region update after the frame changes size"""
+        if not self._scroll_scheduled:
+            self._scroll_scheduled = True
+            self.canvas.after_idle(self._update_scrollregion)
+    
+    def _update_scrollregion(self):
+        """Set the scroll region from the frame's requested size"""
+        self._scroll_scheduled = False
+        width = self.scrollable_frame.winfo_reqwidth()
+        height = self.scrollable_frame.winfo_reqheight()
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+    
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
         if event.num == 4 or event.delta > 0:
@@ -76,12 +114,16 @@ class SettingsPanel:
         
         # MQTT Port
         ttk.Label(self.scrollable_frame, text="MQTT Port:").grid(row=row, column=0, padx=10, pady=5, sticky="w")
-        ttk.Entry(self.scrollable_frame, textvariable=self.mqtt_port, width=10).grid(row=row, column=1, padx=10, pady=5, sticky="w")
+        self.mqtt_port_entry = ttk.Entry(self.scrollable_frame, width=10)
+        self.mqtt_port_entry.insert(0, self.mqtt_port)
+        self.mqtt_port_entry.grid(row=row, column=1, padx=10, pady=5, sticky="w")
         row += 1
         
         # Camera Port
         ttk.Label(self.scrollable_frame, text="Camera Port:").grid(row=row, column=0, padx=10, pady=5, sticky="w")
-        ttk.Entry(self.scrollable_frame, textvariable=self.camera_port, width=10).grid(row=row, column=1, padx=10, pady=5, sticky="w")
+        self.camera_port_entry = ttk.Entry(self.scrollable_frame, width=10)
+        self.camera_port_entry.insert(0, self.camera_port)
+        self.camera_port_entry.grid(row=row, column=1, padx=10, pady=5, sticky="w")
         row += 1
         
         # Section: Refresh Rates
@@ -90,12 +132,16 @@ class SettingsPanel:
         
         # Camera Refresh Rate (ms)
         ttk.Label(self.scrollable_frame, text="Camera Refresh Rate (ms):").grid(row=row, column=0, padx=10, pady=5, sticky="w")
-        ttk.Entry(self.scrollable_frame, textvariable=self.camera_refresh_rate, width=10).grid(row=row, column=1, padx=10, pady=5, sticky="w")
+        self.camera_refresh_rate_entry = ttk.Entry(self.scrollable_frame, width=10)
+        self.camera_refresh_rate_entry.insert(0, self.camera_refresh_rate)
+        self.camera_refresh_rate_entry.grid(row=row, column=1, padx=10, pady=5, sticky="w")
         row += 1
         
         # Sensor Refresh Rate (ms)
         ttk.Label(self.scrollable_frame, text="Sensor Refresh Rate (ms):").grid(row=row, column=0, padx=10, pady=5, sticky="w")
-        ttk.Entry(self.scrollable_frame, textvariable=self.sensor_refresh_rate, width=10).grid(row=row, column=1, padx=10, pady=5, sticky="w")
+        self.sensor_refresh_rate_entry = ttk.Entry(self.scrollable_frame, width=10)
+        self.sensor_refresh_rate_entry.insert(0, self.sensor_refresh_rate)
+        self.sensor_refresh_rate_entry.grid(row=row, column=1, padx=10, pady=5, sticky="w")
         row += 1
         
         # Section: Key Bindings
@@ -138,16 +184,7 @@ class SettingsPanel:
     
     def get_action_description(self, action):
         """Return description for each action"""
-        descriptions = {
-            "Forward": "Move rover forward",
-            "Backward": "Move rover backward",
-            "Left": "Turn rover left",
-            "Right": "Turn rover right",
-            "Spectral": "Take spectral reading",
-            "Humiture": "Take humiture reading",
-            "Stop": "Stop all motion"
-        }
-        return descriptions.get(action, "")
+        return _ACTION_DESCRIPTIONS.get(action, "")
     
     def on_key_change(self, event, action):
         """Handle key entry change event"""
@@ -166,25 +203,23 @@ class SettingsPanel:
     def load_settings(self):
         """Load settings from config file"""
         try:
-            if os.path.exists(self.app.config_file):
-                with open(self.app.config_file, 'r') as f:
-                    settings = json.load(f)
-                
+            settings = self.app.config
+            if settings:
                 # Load key bindings if present
                 if 'key_bindings' in settings:
                     self.key_bindings.update(settings['key_bindings'])
                 
                 # Load port settings if present
                 if 'mqtt_port' in settings:
-                    self.mqtt_port.set(str(settings['mqtt_port']))
+                    self.mqtt_port = str(settings['mqtt_port'])
                 if 'camera_port' in settings:
-                    self.camera_port.set(str(settings['camera_port']))
+                    self.camera_port = str(settings['camera_port'])
                 
                 # Load refresh rates if present
                 if 'camera_refresh_rate' in settings:
-                    self.camera_refresh_rate.set(str(settings['camera_refresh_rate']))
+                    self.camera_refresh_rate = str(settings['camera_refresh_rate'])
                 if 'sensor_refresh_rate' in settings:
-                    self.sensor_refresh_rate.set(str(settings['sensor_refresh_rate']))
+                    self.sensor_refresh_rate = str(settings['sensor_refresh_rate'])
         except Exception as e:
             print(f"Error loading settings: {e}")
     
@@ -199,19 +234,19 @@ class SettingsPanel:
         # Prepare settings dictionary
         settings = {
             'key_bindings': self.key_bindings,
-            'mqtt_port': int(self.mqtt_port.get()),
-            'camera_port': int(self.camera_port.get()),
-            'camera_refresh_rate': int(self.camera_refresh_rate.get()),
-            'sensor_refresh_rate': int(self.sensor_refresh_rate.get())
+            'mqtt_port': int(self.mqtt_port_entry.get()),
+            'camera_port': int(self.camera_port_entry.get()),
+            'camera_refresh_rate': int(self.camera_refresh_rate_entry.get()),
+            'sensor_refresh_rate': int(self.sensor_refresh_rate_entry.get())
         }
         
         try:
-            # Save to file
-            with open(self.app.config_file, 'w') as f:
-                json.dump(settings, f, indent=4)
+            # Save to file, keeping entries owned by other panels (e.g. the IP address)
+            self.app.config.update(settings)
+            self.app.persist_config()
             
             # Update app settings
-            self.app.MQTT_PORT = int(self.mqtt_port.get())
+            self.app.MQTT_PORT = settings['mqtt_port']
             
             # Apply key bindings
             self.apply_key_bindings()
@@ -224,66 +259,36 @@ class SettingsPanel:
     def reset_to_defaults(self):
         """Reset all settings to default values"""
         # Reset key bindings
-        default_bindings = {
-            "Forward": "w",
-            "Backward": "s",
-            "Left": "a",
-            "Right": "d",
-            "Spectral": "e",
-            "Humiture": "q",
-            "Stop": "x"
-        }
-        
-        self.key_bindings = default_bindings.copy()
+        self.key_bindings = dict(_DEFAULT_BINDINGS)
         
         # Update entry fields
-        for action, key in default_bindings.items():
+        for action, key in _DEFAULT_BINDINGS.items():
             self.key_binding_entries[action].delete(0, tk.END)
             self.key_binding_entries[action].insert(0, key)
         
         # Reset port values
-        self.mqtt_port.set("1883")
-        self.camera_port.set("7123")
+        self._set_entry(self.mqtt_port_entry, "1883")
+        self._set_entry(self.camera_port_entry, "7123")
         
         # Reset refresh rates
-        self.camera_refresh_rate.set("10")
-        self.sensor_refresh_rate.set("100")
+        self._set_entry(self.camera_refresh_rate_entry, "10")
+        self._set_entry(self.sensor_refresh_rate_entry, "100")
         
         self.show_status_message("Settings reset to defaults")
     
+    def _set_entry(self, entry, text):
+        """Replace the text of an entry"""
+        entry.delete(0, tk.END)
+        entry.insert(0, text)
+    
     def apply_key_bindings(self):
         """Apply the current key bindings to the controls panel"""
-        # Find the grid frame in the controls panel
-        controls_panel = self.app.controls_panel
-        for widget in controls_panel.frame.winfo_children():
-            if isinstance(widget, tk.Frame) and len(widget.winfo_children()) > 0:
-                grid_frame = widget
-                
-                # Remove all existing key bindings
-                for key in "wasdeqx":
-                    try:
-                        grid_frame.unbind(key)
-                    except:
-                        pass
-                
-                # Add new key bindings
-                for action, key in self.key_bindings.items():
-                    if action == "Forward":
-                        grid_frame.bind(key, lambda e, btn="Forward (W)": self.app.key_press_handler(btn))
-                    elif action == "Backward":
-                        grid_frame.bind(key, lambda e, btn="Backward (S)": self.app.key_press_handler(btn))
-                    elif action == "Left":
-                        grid_frame.bind(key, lambda e, btn="Left (A)": self.app.key_press_handler(btn))
-                    elif action == "Right":
-                        grid_frame.bind(key, lambda e, btn="Right (D)": self.app.key_press_handler(btn))
-                    elif action == "spectral":
-                        grid_frame.bind(key, lambda e, btn="Spectral (E)": self.app.key_press_handler(btn))
-                    elif action == "humiture":
-                        grid_frame.bind(key, lambda e, btn="Humiture (Q)": self.app.key_press_handler(btn))
-                    elif action == "Stop":
-                        grid_frame.bind(key, lambda e, btn="Stop (X)": self.app.key_press_handler(btn))
-                
-                break
+        key_map = {
+            key.lower(): _ACTION_TO_BUTTON[action]
+            for action, key in self.key_bindings.items()
+            if action in _ACTION_TO_BUTTON
+        }
+        self.app.controls_panel.set_key_map(key_map)
     
     def show_status_message(self, message, error=False):
         """Show a status message in a small popup"""
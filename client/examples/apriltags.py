@@ -3,6 +3,22 @@ import numpy as np
 from lib.apriltag_detector import AprilTagDetector
 import argparse
 
+def window_state(name):
+    """Return 'closed', 'hidden' (minimized) or 'visible' for the named OpenCV window
+    
+    A closed window has no properties at all (-1), while a minimized one
+    still reports its autosize flag; 'hidden' is only returned when the
+    backend can tell the two apart.
+    """
+    try:
+        if cv2.getWindowProperty(name, cv2.WND_PROP_AUTOSIZE) < 0:
+            return 'closed'
+        if cv2.getWindowProperty(name, cv2.WND_PROP_VISIBLE) < 1:
+            return 'hidden'
+    except cv2.error:
+        return 'closed'
+    return 'visible'
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Test AprilTag detection")
@@ -52,6 +68,19 @@ def main():
     saved_count = 0
     
     while True:
+        # Once the window exists: stop if it was closed, and while it is minimized
+        # only grab (without decoding) so the capture doesn't back up and the first
+        # frame shown on return is current
+        if frame_count > 0:
+            state = window_state('AprilTag Detection Test')
+            if state == 'closed':
+                break
+            if state == 'hidden':
+                if not cap.grab():
+                    break
+                cv2.waitKey(1)
+                continue
+        
         # Read frame
         ret, frame = cap.read()
         if not ret:
@@ -62,8 +91,8 @@ def main():
         # Detect AprilTags in the frame
         tags = detector.detect(frame)
         
-        # Draw detections on the frame
-        frame_with_tags = detector.draw_tags(frame.copy(), tags)
+        # Draw detections directly on the frame; it is replaced by the next read anyway
+        frame_with_tags = detector.draw_tags(frame, tags)
         
         # Display tag count in the corner
         cv2.putText(frame_with_tags, f"Tags: {len(tags)}", (10, 30), 
@@ -86,9 +115,15 @@ def main():
         # Print tag info every 30 frames
         if frame_count % 30 == 0 and tags:
             print(f"Detected {len(tags)} tags:")
-            for i, tag in enumerate(tags):
-                distance = np.linalg.norm(tag.pose_t) if hasattr(tag, 'pose_t') else "unknown"
-                print(f"  Tag {i+1}: ID={tag.tag_id}, Distance={distance:.2f}m")
+            # Distances of all tags in one norm call (NaN where no pose was estimated)
+            translations = np.array([
+                np.ravel(tag.pose_t) if getattr(tag, 'pose_t', None) is not None else (np.nan,) * 3
+                for tag in tags
+            ], dtype=np.float64)
+            distances = np.linalg.norm(translations, axis=1)
+            for i, (tag, distance) in enumerate(zip(tags, distances)):
+                distance_text = "unknown" if np.isnan(distance) else f"{distance:.2f}m"
+                print(f"  Tag {i+1}: ID={tag.tag_id}, Distance={distance_text}")
     
     # Release resources
     cap.release()
@@ -120,7 +120,7 @@ class AprilTagDetector:
                     cv2.putText(frame, f"D: {distance:.2f}m", 
                               (center[0] - 10, center[1] + 15),
                               cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
-                    cv2.putText(frame, f"Y: {rot[1]:.1f}°", 
+                    cv2.putText(frame, f"Y: {rot[1]:.1f}deg", 
                               (center[0] - 10, center[1] + 30),
                               cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
                 except Exception as e:
@@ -1,4 +1,5 @@
 import tkinter as tk
+import threading
 import cv2
 import requests
 import numpy as np
@@ -15,17 +16,70 @@ class StreamViewer:
         self.label.pack()
         
         self.bytes_data = bytearray()
-        self.capture = cv2.VideoCapture(url)
+        
+        # Latest decoded frame from the reader thread (replaced, never queued)
+        self.latest_frame = None
+        # Cleared while the window is minimized so the reader stops decoding
+        self.visible = True
+        self.frame_lock = threading.Lock()
+        
+        # Tk photo image reused across frames of the same size
+        self.photo = None
+        self.photo_size = None
+        
+        # Read and decode the stream off the Tk thread
+        self.reader = threading.Thread(target=self.read_stream, daemon=True)
+        self.reader.start()
         self.update_frame()
+    
+    def read_stream(self):
+        """Reader thread: split the multipart stream on JPEG markers and decode each frame"""
+        try:
+            response = requests.get(url, stream=True, timeout=5)
+            for chunk in response.iter_content(chunk_size=16384):
+                self.bytes_data += chunk
+                start = self.bytes_data.find(b'\xff\xd8')
+                if start == -1:
+                    # No frame started yet; keep only a possible partial marker
+                    del self.bytes_data[:-2]
+                    continue
+                end = self.bytes_data.find(b'\xff\xd9', start + 2)
+                if end == -1:
+                    continue
+                if not self.visible:
+                    # Drop the frame without decoding it
+                    del self.bytes_data[:end + 2]
+                    continue
+                
+                jpg = np.frombuffer(self.bytes_data[start:end + 2], dtype=np.uint8)
+                frame = cv2.imdecode(jpg, cv2.IMREAD_COLOR)
+                del self.bytes_data[:end + 2]
+                if frame is not None:
+                    with self.frame_lock:
+                        self.latest_frame = frame
+        except Exception as e:
+            print(f"Stream reader stopped: {e}")
         
     def update_frame(self):
-        ret, frame = self.capture.read()
-        if ret:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image = Image.fromarray(frame)
-            image = ImageTk.PhotoImage(image)
-            self.label.config(image=image)
-            self.label.image = image
+        # Do nothing but poll slowly while the window is minimized
+        self.visible = self.root.state() != 'iconic'
+        if not self.visible:
+            self.root.after(200, self.update_frame)
+            return
+        
+        with self.frame_lock:
+            frame = self.latest_frame
+            self.latest_frame = None
+        if frame is not None:
+            height, width = frame.shape[:2]
+            if self.photo_size != (width, height):
+                self.photo_size = (width, height)
+                self.photo = ImageTk.PhotoImage(Image.new('RGB', (width, height)))
+                self.label.config(image=self.photo)
+            # Let PIL read the BGR pixels directly instead of converting them with
+            # cvtColor first, and overwrite the existing photo's pixels
+            image = Image.frombuffer('RGB', (width, height), frame, 'raw', 'BGR', 0, 1)
+            self.photo.paste(image)
         
         self.root.after(10, self.update_frame)  # Higher refresh rate for better FPS
 
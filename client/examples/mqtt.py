@@ -1,3 +1,5 @@
+import queue
+import threading
 import paho.mqtt.client as mqtt
 
 BROKER = "172.20.10.2"  # Use the Pi's IP if "raspberrypi.local" doesn't work
@@ -5,17 +7,31 @@ PORT = 1883
 TOPIC_SEND = "laptop_to_pi"
 TOPIC_RECEIVE = "pi_to_laptop"
 
+def on_connect(client, userdata, flags, reason_code, properties=None):
+    # Subscribe here so the subscription is restored after a reconnect
+    client.subscribe(TOPIC_RECEIVE)
+
 def on_message(client, userdata, msg):
     print(f"Pi: {msg.payload.decode()}")
 
+def publish_worker(client, outgoing):
+    """Publish queued messages so the input loop never waits on the client"""
+    while True:
+        message = outgoing.get()
+        client.publish(TOPIC_SEND, message, qos=0)
+
 client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)  # Updated for MQTT v5 compatibility
+client.on_connect = on_connect
 client.on_message = on_message
+client.max_inflight_messages_set(100)
+
+# Run the network loop in its own thread, retrying until the broker is reachable
+client.connect_async(BROKER, PORT, 60)
+threading.Thread(target=client.loop_forever, kwargs={"retry_first_connection": True}, daemon=True).start()
 
-client.connect(BROKER, PORT, 60)
-client.subscribe(TOPIC_RECEIVE)
-client.loop_start()
+outgoing = queue.SimpleQueue()
+threading.Thread(target=publish_worker, args=(client, outgoing), daemon=True).start()
 
 print("Type a message to send to Raspberry Pi:")
 while True:
-    message = input("> ")
-    client.publish(TOPIC_SEND, message)
+    outgoing.put(input("> "))
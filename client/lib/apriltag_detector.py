@@ -1,20 +1,16 @@
+import os
+import sys
+import atexit
+import collections
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
 import cv2
 import numpy as np
 from pupil_apriltags import Detector
 
-class AprilTagDetector:
+class TagDrawer:
+    """Draws tag detections on frames; holds the camera parameters used for the pose axes"""
     def __init__(self):
-        # Initialize AprilTag detector with default settings
-        self.detector = Detector(
-            families="tag36h11",  # Default tag family
-            nthreads=1,
-            quad_decimate=1.0,
-            quad_sigma=0.0,
-            refine_edges=1,
-            decode_sharpening=0.25,
-            debug=0
-        )
-        
         # Default camera parameters (can be updated with calibration data)
         # These are placeholder values - for accurate pose estimation, real calibration is needed
         self.camera_params = {
@@ -24,6 +20,10 @@ class AprilTagDetector:
             'cy': 240.0,  # principal point y
             'tag_size': 0.15  # tag size in meters
         }
+        self._update_projection()
+        
+        # Pre-rendered "ID: N" labels, keyed on tag ID (oldest dropped first)
+        self._label_cache = {}
         
     def set_camera_params(self, fx, fy, cx, cy, tag_size):
         """Update camera parameters for better pose estimation"""
@@ -34,105 +34,368 @@ class AprilTagDetector:
             'cy': cy,
             'tag_size': tag_size
         }
+        self._update_projection()
+    
+    def set_tag_size(self, tag_size):
+        """Update the tag size, rebuilding the drawing arrays only if it changed"""
+        if tag_size != self.camera_params['tag_size']:
+            self.camera_params['tag_size'] = tag_size
+            self._update_projection()
+    
+    def _update_projection(self):
+        """Build the arrays draw_tags needs from the camera parameters, once per change"""
+        params = self.camera_params
+        # Intrinsics in the order the detector expects them
+        self._camera_list = [params['fx'], params['fy'], params['cx'], params['cy']]
+        self._K = np.array([
+            [params['fx'], 0, params['cx']],
+            [0, params['fy'], params['cy']],
+            [0, 0, 1]
+        ], dtype=np.float64)
         
-    def detect(self, frame):
-        """Detect AprilTags in the frame and return detection info"""
-        # Convert to grayscale
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = frame
-            
-        # Run detection
-        tags = self.detector.detect(
-            gray, 
-            estimate_tag_pose=True,
-            camera_params=[
-                self.camera_params['fx'], 
-                self.camera_params['fy'], 
-                self.camera_params['cx'], 
-                self.camera_params['cy']
-            ],
-            tag_size=self.camera_params['tag_size']
-        )
+        # Tag origin followed by the X, Y and Z axis endpoints, as columns in
+        # the tag coordinate frame
+        axis_length = params['tag_size'] / 2
+        self._axes = np.array([
+            [0, axis_length, 0, 0],
+            [0, 0, axis_length, 0],
+            [0, 0, 0, axis_length]
+        ], dtype=np.float64)
         
-        return tags
+        # BGR colors for the X (red), Y (green) and Z (blue) axes
+        self._colors = ((0, 0, 255), (0, 255, 0), (255, 0, 0))
+        
+    def _label_tile(self, tag_id):
+        """Return the rendered "ID: N" label for a tag as (image, mask, origin x, origin y)
+        
+        The origin is where putText's text origin sits inside the tile.
+        """
+        tile = self._label_cache.get(tag_id)
+        if tile is None:
+            text = f"ID: {tag_id}"
+            (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+            pad = 2  # Room for the stroke thickness around the text box
+            image = np.zeros((height + baseline + 2 * pad, width + 2 * pad, 3), dtype=np.uint8)
+            cv2.putText(image, text, (pad, height + pad), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+            tile = (image, image.any(axis=2), pad, height + pad)
+            if len(self._label_cache) >= 256:
+                del self._label_cache[next(iter(self._label_cache))]
+            self._label_cache[tag_id] = tile
+        return tile
     
-    def draw_tags(self, frame, tags):
-        """Draw detection results on the frame"""
-        for tag in tags:
+    def _draw_label(self, frame, tag_id, x, y):
+        """Paste the tag's label so its text origin lands at (x, y), clipped to the frame"""
+        image, mask, origin_x, origin_y = self._label_tile(tag_id)
+        top, left = y - origin_y, x - origin_x
+        # Clip the tile against the frame edges
+        y0, x0 = max(top, 0), max(left, 0)
+        y1 = min(top + image.shape[0], frame.shape[0])
+        x1 = min(left + image.shape[1], frame.shape[1])
+        if y0 >= y1 or x0 >= x1:
+            return
+        tile_rows = slice(y0 - top, y1 - top)
+        tile_cols = slice(x0 - left, x1 - left)
+        np.copyto(frame[y0:y1, x0:x1], image[tile_rows, tile_cols],
+                  where=mask[tile_rows, tile_cols, None])
+        
+    def draw_tags(self, frame, tags, has_pose):
+        """Draw detection results on the frame
+        
+        has_pose says whether the detections carry pose_R/pose_t; without it
+        only outlines, IDs and a simple orientation line are drawn.
+        """
+        if not tags:
+            return frame
+        
+        # Convert all corners and centers to pixel coordinates in one go
+        all_corners = np.stack([tag.corners for tag in tags]).astype(np.int32)
+        all_centers = np.stack([tag.center for tag in tags]).astype(np.int32).tolist()
+        
+        # Draw all tag outlines in a single call
+        cv2.polylines(frame, list(all_corners), True, (0, 255, 0), 2)
+        
+        # Project the axes of every posed tag at once with the pinhole model
+        # (no distortion, so projectPoints is not needed)
+        pose_pixels = None
+        if has_pose:
+            # pose_R/pose_t are already float64 arrays, so they are stacked as-is
+            rotations = np.stack([tag.pose_R for tag in tags])
+            translations = np.stack([tag.pose_t for tag in tags]).reshape(-1, 3, 1)
+            
+            # A degenerate pose solve is the only realistic failure; those tags
+            # get the simple orientation line instead of axes
+            pose_valid = (np.isfinite(rotations).all(axis=(1, 2)) &
+                          np.isfinite(translations).all(axis=(1, 2))).tolist()
+            
+            with np.errstate(invalid='ignore', divide='ignore'):
+                # (N, 3, 4) camera-frame points, then (N, 4, 2) pixels
+                projected = self._K @ (rotations @ self._axes + translations)
+                pose_pixels = (projected[:, :2] / projected[:, 2:]).transpose(0, 2, 1).astype(int).tolist()
+                
+                # Rotation around the Y axis, read straight from the rotation matrices
+                yaws = np.degrees(np.arctan2(-rotations[:, 2, 0],
+                                             np.hypot(rotations[:, 0, 0], rotations[:, 1, 0]))).tolist()
+                distances = np.sqrt((translations * translations).sum(axis=(1, 2))).tolist()
+        
+        for i, (tag, corners, center) in enumerate(zip(tags, all_corners, all_centers)):
             # Extract tag information
             tag_id = tag.tag_id
-            center = (int(tag.center[0]), int(tag.center[1]))
-            corners = tag.corners.astype(int)
             
-            # Draw tag outline and ID
-            cv2.polylines(frame, [corners], True, (0, 255, 0), 2)
-            cv2.putText(frame, f"ID: {tag_id}", (center[0] - 10, center[1] - 10),
-                      cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+            # Draw tag ID from the label cache instead of rasterizing it every frame
+            if frame.ndim == 3:
+                self._draw_label(frame, tag_id, center[0] - 10, center[1] - 10)
+            else:
+                cv2.putText(frame, f"ID: {tag_id}", (center[0] - 10, center[1] - 10),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
             
             # Draw orientation if pose information is available
-            if hasattr(tag, 'pose_R') and hasattr(tag, 'pose_t'):
-                try:
-                    # Project the 3D axes onto the image
-                    axis_length = self.camera_params['tag_size'] / 2
-                    projection_matrix = np.array([
-                        [self.camera_params['fx'], 0, self.camera_params['cx']],
-                        [0, self.camera_params['fy'], self.camera_params['cy']],
-                        [0, 0, 1]
-                    ])
-                    
-                    # Define 3D axes in tag coordinate frame
-                    axes_3d = np.array([
-                        [axis_length, 0, 0],  # X-axis (red)
-                        [0, axis_length, 0],  # Y-axis (green)
-                        [0, 0, axis_length]   # Z-axis (blue)
-                    ], dtype=np.float32)
-                    
-                    # Project origin point - ensure proper format for projectPoints
-                    origin = np.zeros((1, 3), dtype=np.float32)
-                    
-                    # Convert rotation and translation to correct types
-                    rotation = np.asarray(tag.pose_R, dtype=np.float64)
-                    translation = np.asarray(tag.pose_t, dtype=np.float64)
-                    
-                    # Project origin
-                    origin_projection, _ = cv2.projectPoints(
-                        origin, rotation, translation, projection_matrix, None
-                    )
-                    origin_point = tuple(map(int, origin_projection[0][0]))
-                    
-                    # Project each axis endpoint
-                    colors = [(0, 0, 255), (0, 255, 0), (255, 0, 0)]  # RGB colors for axes
-                    for i in range(3):
-                        axis_point = np.array([[axes_3d[i][0], axes_3d[i][1], axes_3d[i][2]]], dtype=np.float32)
-                        projected_point, _ = cv2.projectPoints(
-                            axis_point, rotation, translation, projection_matrix, None
-                        )
-                        p_point = tuple(map(int, projected_point[0][0]))
-                        cv2.line(frame, origin_point, p_point, colors[i], 2)
-                    
-                    # Add pose information as text
-                    rot = np.degrees(cv2.Rodrigues(rotation)[0].flatten())
-                    distance = np.linalg.norm(translation)
-                    
-                    # Display distance and rotation around Y axis (yaw)
-                    cv2.putText(frame, f"D: {distance:.2f}m", 
-                              (center[0] - 10, center[1] + 15),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
-                    cv2.putText(frame, f"Y: {rot[1]:.1f}°", 
-                              (center[0] - 10, center[1] + 30),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
-                except Exception as e:
-                    # Fall back to simple orientation if 3D projection fails
-                    print(f"Warning: Failed to draw 3D axes: {e}")
-                    center_to_top = (int((corners[0][0] + corners[3][0]) / 2), 
-                                    int((corners[0][1] + corners[3][1]) / 2))
-                    cv2.line(frame, center, center_to_top, (255, 0, 0), 2)
+            if pose_pixels is not None and pose_valid[i]:
+                pixels = pose_pixels[i]
+                origin_point = tuple(pixels[0])
+                
+                # Draw each axis
+                for axis in range(3):
+                    cv2.line(frame, origin_point, tuple(pixels[axis + 1]), self._colors[axis], 2)
+                
+                # Display distance and rotation around Y axis (yaw)
+                cv2.putText(frame, f"D: {distances[i]:.2f}m", 
+                          (center[0] - 10, center[1] + 15),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
+                cv2.putText(frame, f"Y: {yaws[i]:.1f}deg", 
+                          (center[0] - 10, center[1] + 30),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
             else:
                 # Simple orientation indicator when no pose is available
                 center_to_top = (int((corners[0][0] + corners[3][0]) / 2), 
                                 int((corners[0][1] + corners[3][1]) / 2))
                 cv2.line(frame, center, center_to_top, (255, 0, 0), 2)
         
-        return frame
\ No newline at end of file
+        return frame
+
+
+class AprilTagDetector(TagDrawer):
+    def __init__(self, nthreads=None, quad_decimate=2.0):
+        """Create the detector
+        
+        nthreads defaults to half the CPU cores (at least 2). quad_decimate
+        detects quads on an image decimated by that factor: faster, at the cost
+        of some detection range for small/distant tags (1.0 disables it).
+        """
+        super().__init__()
+        if nthreads is None:
+            nthreads = max(2, (os.cpu_count() or 2) // 2)
+        
+        # Initialize AprilTag detector with default settings
+        self.detector = Detector(
+            families="tag36h11",  # Default tag family
+            nthreads=nthreads,
+            quad_decimate=quad_decimate,
+            quad_sigma=0.0,
+            refine_edges=1,
+            decode_sharpening=0.25,
+            debug=0
+        )
+        
+        # Grayscale buffer reused by detect() for color frames
+        self._gray_buf = None
+        
+        # Whether the last detect() call estimated poses, i.e. whether its
+        # detections carry pose_R/pose_t for draw_tags
+        self._has_pose = False
+        
+    def detect(self, frame, max_width=None, estimate_pose=False):
+        """Detect AprilTags in the frame and return detection info
+        
+        If max_width is given and the frame is wider, detection runs on a
+        downscaled copy and the tag corners/centers are mapped back to the
+        full-resolution frame. Tag poses (pose_R/pose_t) are only solved for
+        when estimate_pose is set, since that is a large part of the detector's
+        time; draw_tags only draws axes and distances for posed detections.
+        """
+        # Convert BGR frames to grayscale into a reused buffer; gray frames are used as-is
+        if frame.ndim == 3:
+            if self._gray_buf is None or self._gray_buf.shape != frame.shape[:2]:
+                self._gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        else:
+            gray = frame
+        
+        # Downscale wide frames; detection cost grows with the pixel count
+        scale = 1.0
+        if max_width and gray.shape[1] > max_width:
+            scale = max_width / gray.shape[1]
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            
+        # Run detection (intrinsics are scaled to match the detection image,
+        # which leaves the estimated pose unchanged)
+        camera_params = self._camera_list
+        if scale != 1.0:
+            camera_params = [value * scale for value in camera_params]
+        self._has_pose = estimate_pose
+        tags = self.detector.detect(
+            gray, 
+            estimate_tag_pose=estimate_pose,
+            camera_params=camera_params,
+            tag_size=self.camera_params['tag_size']
+        )
+        
+        # Map pixel coordinates back to the full-resolution frame
+        if scale != 1.0:
+            for tag in tags:
+                tag.center = tag.center / scale
+                tag.corners = tag.corners / scale
+        
+        return tags
+    
+    def draw_tags(self, frame, tags, has_pose=None):
+        """Draw detection results on the frame
+        
+        has_pose defaults to whether the last detect() call estimated poses.
+        """
+        if has_pose is None:
+            has_pose = self._has_pose
+        return super().draw_tags(frame, tags, has_pose)
+
+
+# Detection fields draw_tags and the tag panels use, as sent back by the worker process
+TagDetection = collections.namedtuple('TagDetection', 'tag_id center corners pose_R pose_t')
+
+
+def _attach_shm(name):
+    """Attach to the parent's shared memory block without tracking it in this process
+    
+    A tracked block would be unlinked (with a "leaked shared_memory" warning)
+    by the worker's resource tracker when the worker exits, racing the
+    parent, which owns the block and unlinks it itself.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _detector_worker_main(conn, detector_kwargs):
+    """Worker process: detect tags in frames placed in shared memory by DetectorWorker"""
+    detector = AprilTagDetector(**detector_kwargs)
+    shm = None
+    try:
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            name, shape, max_width, estimate_pose, camera_params = request
+            
+            # Attach to the frame buffer; the parent replaces it when the frame size changes
+            if shm is None or shm.name != name:
+                if shm is not None:
+                    shm.close()
+                shm = _attach_shm(name)
+            
+            detector.set_camera_params(**camera_params)
+            gray = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            tags = detector.detect(gray, max_width=max_width, estimate_pose=estimate_pose)
+            del gray  # Release the view so the buffer can be closed
+            
+            conn.send([
+                TagDetection(tag.tag_id, tag.center, tag.corners,
+                             tag.pose_R if estimate_pose else None,
+                             tag.pose_t if estimate_pose else None)
+                for tag in tags
+            ])
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+class DetectorWorker:
+    """AprilTag detection in a separate process, fed through shared memory
+    
+    Grayscale frames are copied into a shared memory block and detected by a
+    persistent worker process, so detection runs alongside capture and drawing
+    instead of blocking them. submit() hands over a frame if the worker is
+    idle and poll() collects the result; detections come back as TagDetection
+    tuples. Drawing and camera parameters go through a local TagDrawer.
+    """
+    def __init__(self, **detector_kwargs):
+        # Draws the results and holds the camera parameters sent with each frame
+        self.drawer = TagDrawer()
+        
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_detector_worker_main, args=(child_conn, detector_kwargs), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        
+        # Shared frame buffer, recreated when the frame size changes
+        self._shm = None
+        self._shm_shape = None
+        self._busy = False
+        self._pending_pose = False  # Whether the frame being detected asked for poses
+        self._has_pose = False  # Whether the last returned detections carry poses
+        atexit.register(self.close)
+    
+    def set_camera_params(self, fx, fy, cx, cy, tag_size):
+        """Update camera parameters; sent to the worker with the next frame"""
+        self.drawer.set_camera_params(fx, fy, cx, cy, tag_size)
+    
+    def set_tag_size(self, tag_size):
+        """Update the tag size; sent to the worker with the next frame"""
+        self.drawer.set_tag_size(tag_size)
+    
+    @property
+    def busy(self):
+        """Whether a submitted frame is still being detected"""
+        return self._busy
+    
+    def submit(self, gray, max_width=None, estimate_pose=False):
+        """Hand a grayscale frame to the worker; returns False if it is still busy"""
+        if self._busy or self._process is None:
+            return False
+        
+        if self._shm_shape != gray.shape:
+            # Only replaced while the worker is idle, so it is not reading the old one
+            self._release_shm()
+            self._shm = shared_memory.SharedMemory(create=True, size=gray.nbytes)
+            self._shm_shape = gray.shape
+        np.ndarray(gray.shape, dtype=np.uint8, buffer=self._shm.buf)[...] = gray
+        
+        self._pending_pose = estimate_pose
+        self._conn.send((self._shm.name, gray.shape, max_width, estimate_pose,
+                         self.drawer.camera_params))
+        self._busy = True
+        return True
+    
+    def poll(self):
+        """Return the detections for the last submitted frame, or None if not done yet"""
+        if self._busy and self._conn.poll():
+            self._busy = False
+            self._has_pose = self._pending_pose
+            return self._conn.recv()
+        return None
+    
+    def draw_tags(self, frame, tags):
+        """Draw detection results on the frame"""
+        return self.drawer.draw_tags(frame, tags, self._has_pose)
+    
+    def close(self):
+        """Stop the worker process and free the shared frame buffer"""
+        if self._process is not None:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+            self._conn.close()
+        self._release_shm()
+    
+    def _release_shm(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            self._shm_shape = None
@@ -0,0 +1,37 @@
+"""
+JSON encoding helpers for MQTT payloads and config files.
+Uses orjson when it is installed and falls back to the standard json module.
+"""
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _default(obj):
+    """Serialize numpy arrays and scalars that the encoder can't handle natively"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Encoders for the standard json fallback, created once and reused
+_compact_encoder = json.JSONEncoder(default=_default, separators=(',', ':'))
+_indent_encoder = json.JSONEncoder(default=_default, indent=2)
+
+def dumps(obj, indent=False):
+    """Encode obj as JSON bytes, serializing numpy arrays directly"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    encoder = _indent_encoder if indent else _compact_encoder
+    return encoder.encode(obj).encode()
+
+def loads(data):
+    """Decode JSON from bytes or str (raises json.JSONDecodeError on bad input)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
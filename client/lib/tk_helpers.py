@@ -0,0 +1,39 @@
+"""
+Small helpers for Tkinter widgets shared by the client panels.
+"""
+
+def configure_cached(widget, **options):
+    """Configure widget options, skipping the Tcl call for values that are already set
+    
+    The last value set through this function is remembered per widget, so
+    options must not be changed with widget.config() elsewhere. Changes go
+    straight to the widget's Tcl configure command, skipping config()'s option
+    parsing, so values must be plain strings, numbers or images (not callbacks).
+    """
+    cache = widget.__dict__.setdefault('_configured_options', {})
+    changed = {key: value for key, value in options.items() if cache.get(key) != value}
+    if changed:
+        args = []
+        for key, value in changed.items():
+            args.append('-' + key)
+            args.append(value)
+        widget.tk.call(widget._w, 'configure', *args)
+        cache.update(changed)
+
+
+def configure_all_cached(widgets, **options):
+    """Like configure_cached for several widgets, but sends every change in one Tcl eval
+    
+    Option values are passed to Tcl brace-quoted, so they must not contain
+    unbalanced braces.
+    """
+    commands = []
+    for widget in widgets:
+        cache = widget.__dict__.setdefault('_configured_options', {})
+        changed = {key: value for key, value in options.items() if cache.get(key) != value}
+        if changed:
+            args = " ".join(f"-{key} {{{value}}}" for key, value in changed.items())
+            commands.append(f"{widget._w} configure {args}")
+            cache.update(changed)
+    if commands:
+        widgets[0].tk.eval("\n".join(commands))
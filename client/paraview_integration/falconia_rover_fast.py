@@ -14,6 +14,9 @@ USAGE IN PARAVIEW:
 from paraview.simple import *
 import json
 import time
+import numpy as np
+import threading
+from collections import deque
 
 try:
     import paho.mqtt.client as mqtt
@@ -22,14 +25,33 @@ except ImportError:
     MQTT_AVAILABLE = False
     print("⚠️ Install paho-mqtt for live tracking")
 
+# orjson decodes the position payloads faster; fall back to the json module
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads  # Also accepts the raw payload bytes
+
 # Global variables
 rover_source = None
 rover_rep = None
+model_source = None  # Falconia model proxy, looked up once by get_model_source()
 mqtt_client = None
+model_bounds = None  # (xmin, xmax, ymin, ymax, zmin, zmax) of the model
+model_widths = None  # (x, y, z) extents of the model
 latest_position = [0, 0, 0]
-position_history = []
+position_history = deque(maxlen=100)  # Oldest positions drop off automatically
 last_update_time = 0
 
+# Newest raw MQTT payload, written by paho's network thread and parsed only
+# when the visualization is updated; superseded payloads are counted, not parsed
+_pending_payload = None
+_pending_lock = threading.Lock()
+dropped_messages = 0
+
+# Set when latest_position changes and the sphere hasn't been moved to it yet
+_dirty = False
+
 def setup_fast_tracking(mqtt_broker="localhost", mqtt_port=1883):
     """Setup fast rover tracking (MQTT only, no camera processing)"""
     
@@ -54,24 +76,48 @@ def setup_fast_tracking(mqtt_broker="localhost", mqtt_port=1883):
     print("📊 Run: show_status() for connection info")
     return True
 
+def get_model_source():
+    """Return the Falconia model source, resolving it from the active source only once
+    
+    Once the rover sphere exists it becomes ParaView's active source, so later
+    GetActiveSource() calls would return the sphere instead of the model.
+    """
+    global model_source
+    
+    if model_source is None:
+        active_source = GetActiveSource()
+        if active_source and active_source is not rover_source:
+            model_source = active_source
+    return model_source
+
+def invalidate_model_source():
+    """Forget the cached model source (e.g. after loading a different model)"""
+    global model_source
+    model_source = None
+
+def set_model_bounds(bounds):
+    """Store the model bounds as an array, along with the per-axis widths"""
+    global model_bounds, model_widths
+    model_bounds = np.asarray(bounds, dtype=np.float64)
+    model_widths = model_bounds[1::2] - model_bounds[0::2]
+
 def create_rover_sphere():
     """Create red rover sphere"""
     global rover_source, rover_rep
     
     # Get model bounds for sizing
-    active_source = GetActiveSource()
+    active_source = get_model_source()
     if active_source:
-        data_info = active_source.GetDataInformation()
-        bounds = data_info.GetBounds()
-        model_size = max(bounds[1] - bounds[0], bounds[5] - bounds[4])
+        set_model_bounds(active_source.GetDataInformation().GetBounds())
+        model_size = max(model_widths[0], model_widths[2])
         rover_size = model_size * 0.02
-        hover_y = bounds[3] * 0.95
+        hover_y = model_bounds[3] * 0.95
     else:
         rover_size = 0.05
         hover_y = 0.2
     
-    # Create dynamic rover sphere
-    rover_source = LiveProgrammableSource()
+    # Create the rover sphere once; updates only change its center and radius
+    rover_source = Sphere(PhiResolution=20, ThetaResolution=20)
     update_rover_geometry([0, hover_y, 0], rover_size)
     
     # Style the rover
@@ -91,19 +137,10 @@ def update_rover_geometry(position, size):
         x, y, z = position
         print(f"🔧 Updating sphere: pos=[{x:.3f}, {y:.3f}, {z:.3f}], size={size:.3f}")
         
-        rover_source.Script = f"""
-import vtk
-sphere = vtk.vtkSphereSource()
-sphere.SetCenter({x}, {y}, {z})
-sphere.SetRadius({size})
-sphere.SetPhiResolution(20)
-sphere.SetThetaResolution(20)
-sphere.Update()
-output = self.GetOutput()
-output.ShallowCopy(sphere.GetOutput())
-print(f"VTK: Created sphere at [{x}, {y}, {z}] with radius {size}")
-"""
-        rover_source.Modified()
+        # Setting the properties marks the source modified; no script is
+        # regenerated or re-executed per update
+        rover_source.Center = [x, y, z]
+        rover_source.Radius = size
         rover_source.UpdatePipeline()
         print(f"✅ Geometry updated and pipeline refreshed")
     else:
@@ -118,9 +155,11 @@ def setup_mqtt_subscription(mqtt_broker, mqtt_port):
         mqtt_client.on_connect = on_mqtt_connect
         mqtt_client.on_message = on_mqtt_message
         
-        mqtt_client.connect(mqtt_broker, mqtt_port, 60)
+        # paho's network thread connects (and reconnects) in the background, so
+        # ParaView's interpreter is never blocked on the broker
+        mqtt_client.connect_async(mqtt_broker, mqtt_port, 60)
         mqtt_client.loop_start()
-        print(f"📡 MQTT client connected to {mqtt_broker}:{mqtt_port}")
+        print(f"📡 MQTT client connecting to {mqtt_broker}:{mqtt_port}")
         return True
         
     except Exception as e:
@@ -137,10 +176,30 @@ def on_mqtt_connect(client, userdata, flags, rc, properties=None):
 
 def on_mqtt_message(client, userdata, msg):
     """Handle incoming rover position from background service"""
-    global latest_position, position_history, last_update_time
+    global _pending_payload, dropped_messages, last_update_time
+    
+    # Only keep the newest payload; it is decoded by consume_pending_position()
+    with _pending_lock:
+        if _pending_payload is not None:
+            dropped_messages += 1
+        _pending_payload = msg.payload
+        last_update_time = time.time()
+    
+    # Optional: auto-update visualization
+    # update_position()  # Uncomment for automatic updates
+
+def consume_pending_position():
+    """Decode the newest MQTT position, if one arrived; returns True if it did"""
+    global _pending_payload, latest_position, _dirty
+    
+    with _pending_lock:
+        payload = _pending_payload
+        _pending_payload = None
+    if payload is None:
+        return False
     
     try:
-        data = json.loads(msg.payload.decode())
+        data = _loads(payload)
         
         # Extract position from service message
         pos = data["position"]
@@ -148,34 +207,30 @@ def on_mqtt_message(client, userdata, msg):
         
         # Add to history
         position_history.append(latest_position.copy())
-        if len(position_history) > 100:
-            position_history.pop(0)
-        
-        last_update_time = time.time()
-        
-        # Optional: auto-update visualization
-        # update_position()  # Uncomment for automatic updates
+        _dirty = True
+        return True
         
     except Exception as e:
         print(f"❌ MQTT message error: {e}")
+        return False
 
 def update_position():
     """Update rover position - very fast since no camera processing!"""
-    global latest_position, last_update_time
+    global latest_position, last_update_time, _dirty
     
+    consume_pending_position()
     if not latest_position:
         print("⚠️ No rover position received yet")
         return
     
-    # Get model info for sizing
-    active_source = GetActiveSource()
-    if active_source:
-        data_info = active_source.GetDataInformation()
-        bounds = data_info.GetBounds()
-        model_size = max(bounds[1] - bounds[0], bounds[5] - bounds[4])
-        rover_size = 0.05
-    else:
-        rover_size = 0.05
+    # Skip the geometry update and render if the position hasn't changed
+    if not _dirty:
+        print("⏸️ No new rover position since the last update")
+        return
+    _dirty = False
+    
+    # Fixed rover size for live updates (the model bounds aren't needed)
+    rover_size = 0.05
     
     # Update visualization
     update_rover_geometry(latest_position, rover_size)
@@ -196,11 +251,10 @@ def set_rover_position(x, y, z):
     
     latest_position = [x, y, z]
     
-    active_source = GetActiveSource()
+    active_source = get_model_source()
     if active_source:
-        data_info = active_source.GetDataInformation()
-        bounds = data_info.GetBounds()
-        model_size = max(bounds[1] - bounds[0], bounds[5] - bounds[4])
+        set_model_bounds(active_source.GetDataInformation().GetBounds())
+        model_size = max(model_widths[0], model_widths[2])
         rover_size = model_size * 0.02
     else:
         rover_size = 0.05
@@ -222,6 +276,8 @@ def show_status():
     print("📊 Fast Tracking Status")
     print("=" * 30)
     
+    consume_pending_position()
+    
     if mqtt_client and mqtt_client.is_connected():
         print("📡 MQTT: Connected ✅")
     else:
@@ -229,6 +285,7 @@ def show_status():
     
     print(f"📍 Latest position: {latest_position}")
     print(f"📈 Position history: {len(position_history)} points")
+    print(f"⏭️ Superseded messages (not decoded): {dropped_messages}")
     
     if last_update_time > 0:
         age = time.time() - last_update_time
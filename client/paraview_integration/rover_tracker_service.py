@@ -28,6 +28,7 @@ class RoverTrackerService:
         self.corners_data = None
         self.pixel_corners = None
         self.model_coords = None
+        self.homography = None
         self.detector = None
         self.camera_capture = None
         self.mqtt_client = None
@@ -101,6 +102,8 @@ class RoverTrackerService:
         try:
             self.pixel_corners = np.array(pixel_points, dtype=np.float32)
             self.model_coords = np.array(model_points, dtype=np.float32)
+            # The homography only depends on the calibration, so compute it once
+            self.homography = cv2.getPerspectiveTransform(self.pixel_corners, self.model_coords)
             print("✅ Coordinate transformation ready")
             return True
         except Exception as e:
@@ -110,16 +113,12 @@ class RoverTrackerService:
     def pixel_to_model_coords(self, pixel_x, pixel_y):
         """Transform pixel coordinates to model coordinates"""
         try:
-            # Calculate homography matrix
-            homography_matrix = cv2.getPerspectiveTransform(self.pixel_corners, self.model_coords)
-            
-            # Transform the pixel point
-            pixel_point = np.array([[[pixel_x, pixel_y]]], dtype=np.float32)
-            model_point = cv2.perspectiveTransform(pixel_point, homography_matrix)
+            # Apply the precomputed homography to the point in homogeneous coordinates
+            x, z, w = (self.homography @ np.array([pixel_x, pixel_y, 1.0])).tolist()
             
             # Extract coordinates
-            model_x = float(model_point[0][0][0])
-            model_z = float(model_point[0][0][1])
+            model_x = x / w
+            model_z = z / w
             model_y = 0.2  # Fixed hover height
             
             return [model_x, model_y, model_z]
@@ -1,11 +1,27 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 from time import strftime, localtime, time
-logname = 'logs/{}.txt'.format(strftime("%d-%b-%Y_%H:%M:%S", localtime(time())))
-logging.basicConfig(filename=logname,
-                    filemode='a',
-                    format='%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s',
-                    datefmt='%H:%M:%S',
-                    level=logging.DEBUG)
+logname = f'logs/{strftime("%d-%b-%Y_%H:%M:%S", localtime(time()))}.txt'
 
-def log(data):
-	logging.info(data)
+# Records are queued by the calling thread and written to the file by a
+# listener thread, so log() never waits on disk I/O
+_file_handler = logging.FileHandler(logname, mode='a')
+_file_handler.setFormatter(logging.Formatter('%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s',
+                                             datefmt='%H:%M:%S'))
+_log_queue = queue.Queue(-1)
+logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.root.setLevel(logging.DEBUG)
+_listener = logging.handlers.QueueListener(_log_queue, _file_handler)
+_listener.start()
+atexit.register(_listener.stop)  # Flush queued records on exit
+
+# Logger used by log(), looked up once
+_logger = logging.getLogger('falconia')
+_logger.setLevel(logging.DEBUG)
+
+def log(msg, *args):
+	"""Log an info message; pass a %-format string and args so formatting only
+	happens when the record is actually emitted, e.g. log("tags=%s", tags)"""
+	_logger.info(msg, *args)
@@ -116,10 +116,10 @@ def start_camera_server():
         camera_thread.daemon = True
         camera_thread.start()
         
-        log.log(f"Camera server started on port {CAMERA_PORT}")
+        log.log("Camera server started on port %s", CAMERA_PORT)
         return True
     except Exception as e:
-        log.log(f"Error starting camera server: {e}")
+        log.log("Error starting camera server: %s", e)
         return False
 
 
@@ -129,13 +129,30 @@ def on_connect(client, userdata, flags, rc, properties=None):
         log.log("Connected to MQTT broker")
         client.subscribe(TOPIC_RECEIVE)
     else:
-        log.log(f"Failed to connect to MQTT broker with code {rc}")
+        log.log("Failed to connect to MQTT broker with code %s", rc)
 
 
 def on_message(client, userdata, msg):
     """Handle commands from the laptop client"""
     command = msg.payload.decode()
-    log.log(f"Received command: {command}")
+    
+    # The client batches messages sent in quick succession
+    if command.startswith('{'):
+        try:
+            data = json.loads(command)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict) and data.get("type") == "batch":
+            for entry in data.get("msgs", []):
+                handle_command(client, entry if isinstance(entry, str) else json.dumps(entry))
+            return
+    
+    handle_command(client, command)
+
+
+def handle_command(client, command):
+    """Run a single command from the laptop client"""
+    log.log("Received command: %s", command)
     
     if command == "calibrate":
         # Perform calibration
@@ -204,7 +221,7 @@ def start_mqtt():
         mqtt_client.loop_start()
         return True
     except Exception as e:
-        log.log(f"MQTT connection error: {e}")
+        log.log("MQTT connection error: %s", e)
         return False
 
 
@@ -238,7 +255,7 @@ def send_sensor_data():
             sleep(0.1)  # 10Hz - balanced between responsiveness and bandwidth
             
         except Exception as e:
-            log.log(f"Error sending sensor data: {e}")
+            log.log("Error sending sensor data: %s", e)
             sleep(1)  # Wait before retrying
 
 